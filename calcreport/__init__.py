@@ -2,6 +2,15 @@ from .display import displaymath, create_results_table, render_content
 from .utils import escape_latex, replace_greek_letters, format_var_name
 from .constants import greek_letters
 from .units import u, Q_
+from .report import Report
+from .parametric import run_parametric
+from .sweep import LoadCaseSweep, SweepResult
+from .graph import CalcGraph
+from .cache import CacheStore, disk_cache
+from .substitution import SubstitutionTemplate, displaysubs
 
 __all__ = ['displaymath', 'create_results_table', 'escape_latex', 'render_content',
-           'replace_greek_letters', 'format_var_name', 'greek_letters', 'Q_', 'u']
\ No newline at end of file
+           'replace_greek_letters', 'format_var_name', 'greek_letters', 'Q_', 'u', 'Report',
+           'run_parametric', 'LoadCaseSweep', 'SweepResult',
+           'CalcGraph', 'CacheStore', 'disk_cache',
+           'SubstitutionTemplate', 'displaysubs']
\ No newline at end of file
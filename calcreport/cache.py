@@ -0,0 +1,260 @@
+import functools
+import hashlib
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import warnings
+from pathlib import Path
+import numpy as np
+import sympy as sp
+from .units import u
+
+# Bump when the key or file format changes to invalidate every existing entry
+CACHE_FORMAT_VERSION = 3
+
+# Types whose repr is the same in every session
+PLAIN_TYPES = (str, bytes, bool, int, float, complex, type(None), type(Ellipsis), np.generic)
+
+def cache_version_tag():
+    """Version tag entries are stored under, so a sympy or Python upgrade never reads stale results."""
+    return f"v{CACHE_FORMAT_VERSION}-sympy{sp.__version__}-py{sys.version_info[0]}.{sys.version_info[1]}"
+
+def stable_repr(obj):
+    """
+    Build a representation of a value that is identical across sessions.
+
+    SymPy objects use srepr, which captures the full expression tree including symbol
+    assumptions, rather than hash(), which is randomized per process.
+
+    Raises:
+        TypeError: For objects without a stable representation, such as functions or
+            class instances whose repr includes their memory address.
+    """
+    if isinstance(obj, sp.Basic):
+        return f"sympy:{sp.srepr(obj)}"
+    if isinstance(obj, sp.MatrixBase):
+        return f"matrix:{sp.srepr(sp.ImmutableMatrix(obj))}"
+    if isinstance(obj, u.Quantity):
+        return f"quantity:({stable_repr(obj.magnitude)},{obj.units})"
+    if isinstance(obj, np.ndarray) and obj.dtype.hasobject:
+        # The raw bytes of object arrays are pointers, represent the elements instead
+        return f"ndarray:{obj.dtype}:{obj.shape}:[" + ",".join(stable_repr(item) for item in obj.ravel()) + "]"
+    if isinstance(obj, np.ndarray):
+        return f"ndarray:{obj.dtype}:{obj.shape}:{hashlib.sha256(np.ascontiguousarray(obj).tobytes()).hexdigest()}"
+    if isinstance(obj, dict):
+        items = sorted((stable_repr(key), stable_repr(value)) for key, value in obj.items())
+        return "dict:{" + ",".join(f"{key}:{value}" for key, value in items) + "}"
+    if isinstance(obj, (list, tuple)):
+        return f"{type(obj).__name__}:[" + ",".join(stable_repr(item) for item in obj) + "]"
+    if isinstance(obj, (set, frozenset)):
+        return "set:{" + ",".join(sorted(stable_repr(item) for item in obj)) + "}"
+    if isinstance(obj, PLAIN_TYPES):
+        return f"{type(obj).__name__}:{obj!r}"
+    raise TypeError(f"No stable representation for {type(obj).__name__} objects")
+
+def code_fingerprint(code):
+    """Hash of a code object's bytecode, constants and names, including nested functions."""
+    consts = [code_fingerprint(const) if hasattr(const, 'co_code') else stable_repr(const)
+              for const in code.co_consts]
+    parts = [code.co_code.hex(), stable_repr(consts), stable_repr(code.co_names)]
+    return hashlib.sha256("\0".join(parts).encode('utf-8')).hexdigest()
+
+def _closure_values(func):
+    values = []
+    for cell in func.__closure__ or ():
+        try:
+            values.append(cell.cell_contents)
+        except ValueError:
+            # Cell not assigned yet
+            values.append(None)
+    return values
+
+class CacheStore:
+    """
+    On-disk store for expensive results, with size-bounded LRU eviction.
+
+    Entries live under a directory named by cache_version_tag(), so upgrading sympy
+    starts a fresh cache. Each entry is written to a temporary file and moved into
+    place atomically, so any number of processes can read the store while another
+    writes to it. Workers that should only consume results can open it read_only.
+    """
+
+    def __init__(self, path=None, max_size=512 * 1024**2, read_only=False):
+        """
+        Args:
+            path: Cache directory. Defaults to $CALCREPORT_CACHE_DIR or ~/.cache/calcreport.
+            max_size: Maximum total size of stored entries in bytes.
+            read_only: Never write, refresh or evict entries.
+        """
+        if path is None:
+            path = os.environ.get('CALCREPORT_CACHE_DIR', Path.home() / '.cache' / 'calcreport')
+        self.root = Path(path)
+        self.path = self.root / cache_version_tag()
+        self.max_size = max_size
+        self.read_only = read_only
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._size = None
+
+    def key(self, *parts):
+        """Hash the stable representation of the given parts into an entry key."""
+        return hashlib.sha256(stable_repr(parts).encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key):
+        return self.path / key[:2] / f"{key}.pkl"
+
+    def get(self, key):
+        """
+        Look up an entry.
+
+        Returns:
+            (found, value) tuple
+        """
+        entry = self._entry_path(key)
+        try:
+            with open(entry, 'rb') as f:
+                value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            self.misses += 1
+            return False, None
+        if not self.read_only:
+            # Touch the entry so eviction sees it as recently used
+            try:
+                os.utime(entry)
+            except OSError:
+                pass
+        self.hits += 1
+        return True, value
+
+    def set(self, key, value):
+        """Store an entry, evicting the least recently used entries if over max_size."""
+        if self.read_only:
+            return
+        entry = self._entry_path(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=entry.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, entry)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        if self._size is None:
+            self._size = self.size()
+        else:
+            self._size += entry.stat().st_size
+        if self._size > self.max_size:
+            self.evict()
+
+    def _entries(self):
+        if not self.path.exists():
+            return []
+        return [(entry, entry.stat()) for entry in self.path.glob('*/*.pkl')]
+
+    def size(self):
+        """Total size of stored entries in bytes."""
+        return sum(stat.st_size for _, stat in self._entries())
+
+    def evict(self, target_size=None):
+        """Remove least recently used entries until the store is below target_size (default 90% of max_size)."""
+        if self.read_only:
+            return
+        if target_size is None:
+            target_size = int(self.max_size * 0.9)
+        entries = sorted(self._entries(), key=lambda item: item[1].st_mtime)
+        total = sum(stat.st_size for _, stat in entries)
+        for entry, stat in entries:
+            if total <= target_size:
+                break
+            try:
+                entry.unlink()
+            except FileNotFoundError:
+                # Another process evicted it first
+                pass
+            total -= stat.st_size
+            self.evictions += 1
+        self._size = total
+
+    def clear(self):
+        """Remove every entry for the current version."""
+        if not self.read_only and self.path.exists():
+            shutil.rmtree(self.path)
+        self._size = 0
+
+    def purge_stale_versions(self):
+        """Remove entries written by other sympy, Python or cache format versions."""
+        if self.read_only or not self.root.exists():
+            return
+        for version_dir in self.root.iterdir():
+            if version_dir.is_dir() and version_dir != self.path:
+                shutil.rmtree(version_dir, ignore_errors=True)
+
+    def stats(self):
+        """Return hit/miss counts and the current size of the store."""
+        entries = self._entries()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': len(entries),
+            'size': sum(stat.st_size for _, stat in entries),
+            'version': cache_version_tag(),
+        }
+
+_default_store = None
+
+def default_store():
+    """Return the shared store used by disk_cache when none is given."""
+    global _default_store
+    if _default_store is None:
+        _default_store = CacheStore()
+    return _default_store
+
+def disk_cache(func=None, *, store=None):
+    """
+    Persist the results of an expensive function, typically a sympy solve or simplify, on disk.
+
+    Results are keyed by the function's qualified name, a hash of its code, its
+    default argument and closure values, and a stable hash of the arguments, so
+    they survive kernel restarts but not edits to the function. Calls with values
+    that have no stable representation are not cached. The store is available as wrapped.cache_store for statistics.
+
+    Usage:
+        @disk_cache
+        def solve_frame(equations, unknowns):
+            return sp.solve(equations, unknowns, dict=True)
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache_store = wrapper.cache_store
+            try:
+                # Defaults and closure values can change without the code changing
+                key = cache_store.key(func.__module__, func.__qualname__, wrapper.code_hash,
+                                      func.__defaults__, func.__kwdefaults__, _closure_values(func),
+                                      args, kwargs)
+            except TypeError as error:
+                warnings.warn(f"{func.__qualname__} result not cached: {error}")
+                return func(*args, **kwargs)
+            found, value = cache_store.get(key)
+            if found:
+                return value
+            value = func(*args, **kwargs)
+            cache_store.set(key, value)
+            return value
+
+        wrapper.cache_store = store or default_store()
+        wrapper.code_hash = code_fingerprint(func.__code__)
+        return wrapper
+
+    if func is not None:
+        return decorator(func)
+    return decorator
@@ -1,11 +1,11 @@
 import sympy as sp
 import inspect
-import numpy as np
 import pandas as pd
-from sympy import Matrix, latex
-from IPython.display import display, HTML
+from IPython import get_ipython
+from IPython.display import display, update_display, HTML
 from .utils import escape_latex, replace_greek_letters, format_var_name
-from .units import u, Q_
+from .units import u, Q_, unit_latex, format_quantity_latex, format_quantity_html
+from .report import get_active_report
 
 DEBUG_MODE = False  
 
@@ -13,6 +13,11 @@ def debug_print(*args, **kwargs):
     if DEBUG_MODE:
         print("DEBUG:", *args, **kwargs)
 
+def frontend_attached():
+    """Return True when running under a Jupyter kernel that can show rich output."""
+    shell = get_ipython()
+    return shell is not None and getattr(shell, 'kernel', None) is not None
+
 def capture_var_name(func):
     #Capture the variable name of the first argument passed to the function
     def wrapper(*args, **kwargs):
@@ -25,12 +30,32 @@ def capture_var_name(func):
 @capture_var_name
 def displaymath(var_name, expr, comment='', comment_size="small", equation_size="small", line_height="1.2", comment_width="50%"):
     #Generate LaTeX code for the expression and display it
+    equation_latex = format_equation(var_name, expr)
+    render_content(equation_latex, comment=comment, content_type='latex', equation_size=equation_size, comment_size=comment_size, line_height=line_height, comment_width=comment_width)
+
+def format_equation(var_name, expr):
+    """Generate the LaTeX equation displaymath shows for a variable name and value."""
     debug_print(f"Input expression: {expr}")
     debug_print(f"Type of expression: {type(expr)}")
     debug_print(f"Variable name: {var_name}")
     
     formatted_var_name = format_var_name(var_name)
     debug_print(f"Formatted variable name: {formatted_var_name}")
+
+    if isinstance(expr, sp.core.relational.Equality):
+        debug_print("Expression is a SymPy Equality.")
+        # If it's a SymPy Equality, format it as an equation
+        expr = sp.sympify(replace_greek_letters(expr))
+        debug_print(f"Formatted expression: {expr}")
+        equation_latex = f"{sp.latex(expr.lhs)} = {sp.latex(expr.rhs)}"
+    else:
+        equation_latex = f"{formatted_var_name} = {format_value(expr)}"
+
+    debug_print(f"Generated LaTeX: {equation_latex}")
+    return equation_latex
+
+def format_value(expr):
+    """Generate LaTeX for the right hand side of an equation: a SymPy expression, Quantity or plain value."""
     # Check if expr is a SymPy expression
     if isinstance(expr, sp.Basic):
         debug_print("Expression is a SymPy Basic type.")
@@ -39,40 +64,30 @@ def displaymath(var_name, expr, comment='', comment_size="small", equation_size=
             debug_print("Expression is a SymPy Matrix.")
             # If it's a SymPy matrix, format it as an equation
             expr = replace_greek_letters(expr)
-            equation_latex = f"{formatted_var_name} = {sp.latex(expr)}"
-    
-        elif isinstance(expr, sp.core.relational.Equality):
-            debug_print("Expression is a SymPy Equality.")
-            # If it's a SymPy Equality, format it as an equation
-            expr = sp.sympify(replace_greek_letters(expr))
-            debug_print(f"Formatted expression: {expr}")
-            equation_latex = f"{sp.latex(expr.lhs)} = {sp.latex(expr.rhs)}"
+            value_latex = sp.latex(expr)
         
         else:
             debug_print("Expression is a SymPy expression but not a Matrix.")
             # If it's another SymPy expression, format it as an equation
             expr = replace_greek_letters(expr)
             debug_print(f"Formatted expression: {expr}")
-            equation_latex = f"{formatted_var_name} = {sp.latex(expr)}"
-            debug_print(f"Equation LaTeX: {equation_latex}")
+            value_latex = sp.latex(expr)
   
     elif isinstance(expr, sp.Matrix):
         debug_print("Expression is a SymPy Matrix with units.")
         # If it's a SymPy matrix with units, format each element
-        matrix_latex = replace_greek_letters(sp.latex(expr.applyfunc(lambda x: x)))
-        equation_latex = f"{formatted_var_name} = {matrix_latex}"
+        value_latex = replace_greek_letters(sp.latex(expr.applyfunc(lambda x: x)))
 
     elif isinstance(expr, u.Quantity):
         debug_print("Expression is a pint Quantity.")
 
-        if isinstance(expr.magnitude, np.ndarray):
-            debug_print("Magnitude is a NumPy array.")
-            debug_print(f"Sympified expression: {expr}")
-            equation_latex = f"{formatted_var_name} = {sp.latex(Matrix(expr.magnitude))} \\, {sp.latex(expr.units)}"
+        if isinstance(expr.magnitude, sp.Basic):
+            debug_print("Magnitude is a SymPy expression.")
+            value_latex = f"{sp.latex(expr.magnitude)} \\, {unit_latex(expr.units)}"
 
         else:
-            debug_print("Magnitude is not a NumPy array.")
-            equation_latex = f"{formatted_var_name} = {sp.latex(expr.magnitude)} \\, {sp.latex(expr.units)}"
+            # Numeric magnitudes and units are formatted directly, without the sympy printer
+            value_latex = format_quantity_latex(expr)
     
     else:
         debug_print("Expression is a regular variable.")
@@ -83,20 +98,18 @@ def displaymath(var_name, expr, comment='', comment_size="small", equation_size=
         else:
             value_latex = str(expr)
 
-        equation_latex = f"{formatted_var_name} = {value_latex}"
-
-    debug_print(f"Generated LaTeX: {equation_latex}")
-    render_content(equation_latex, comment=comment, content_type='latex', equation_size=equation_size, comment_size=comment_size, line_height=line_height, comment_width=comment_width)
+    return value_latex
 
 def render_content(content, comment='', content_type='latex', equation_size='small', 
-                  comment_size='small', line_height='1.2', comment_width='50%'):
-    """Render LaTeX equations or HTML content with optional comments."""
+                  comment_size='small', line_height='1.2', comment_width='50%', display_id=None, update=False):
+    """
+    Render LaTeX equations or HTML content with optional comments.
+
+    Pass a display_id to be able to replace the output later, then call again with
+    update=True and the same display_id to update it in place.
+    """
     content_html = rf"\[ {content} \]" if content_type == 'latex' else content
-    html_code = f"""
-    <script type="text/javascript" async src="https://cdnjs.cloudflare.com/ajax/libs/mathjax/2.7.7/MathJax.js?config=TeX-MML-AM_CHTML"></script>
-    <script type="text/javascript">
-         MathJax.Hub.Queue(["Typeset", MathJax.Hub]);
-    </script>
+    math_html = f"""
     <div class="math">
         <div class="math-equation">
          {content_html}
@@ -106,10 +119,28 @@ def render_content(content, comment='', content_type='latex', equation_size='sma
         </div>
     </div>
     """
-    display(HTML(html_code))
+    report = get_active_report()
+    if report is not None and not update:
+        report.add_html(math_html)
+    if report is not None and not frontend_attached():
+        return
+    html_code = f"""
+    <script type="text/javascript" async src="https://cdnjs.cloudflare.com/ajax/libs/mathjax/2.7.7/MathJax.js?config=TeX-MML-AM_CHTML"></script>
+    <script type="text/javascript">
+         MathJax.Hub.Queue(["Typeset", MathJax.Hub]);
+    </script>{math_html}"""
+    if update:
+        update_display(HTML(html_code), display_id=display_id)
+    else:
+        display(HTML(html_code), display_id=display_id)
+
+def create_results_table(*solutions, case_names=None, custom_classes="results-table", decimals=2, sig_figs=None):
+    """
+    Create an HTML table from multiple solution dictionaries.
 
-def create_results_table(*solutions, case_names=None, custom_classes="results-table"):
-    """Create an HTML table from multiple solution dictionaries."""
+    Quantities are shown in their own units, plain numbers are taken to be kN.
+    sig_figs, if given, takes precedence over decimals.
+    """
 
     if case_names is None:
         case_names = [f"Case {i+1}" for i in range(len(solutions))]
@@ -118,14 +149,24 @@ def create_results_table(*solutions, case_names=None, custom_classes="results-ta
     for sol, case in zip(solutions, case_names):
         row = {'Load Case': case}
         for key, value in sol.items():
-            value = round(float(value), 2)
-            value = Q_(value, u.kN)
-            row[str(key)] = f"{value:.2f~P}"
+            if not isinstance(value, u.Quantity):
+                value = Q_(float(value), u.kN)
+            row[str(key)] = format_quantity_html(value, sig_figs=sig_figs, decimals=decimals)
         data.append(row)
     
     df = pd.DataFrame(data)
+    return results_table_html(df, custom_classes=custom_classes)
+
+def results_table_html(df, custom_classes="results-table", cell_classes=None):
+    """Render a DataFrame of formatted results as a results table, optionally with per-cell CSS classes."""
     styled_table = df.style.hide(axis='index')
+    if cell_classes is not None:
+        styled_table = styled_table.set_td_classes(cell_classes)
     html_table = styled_table.to_html(table_id="results_table")
     html_table = html_table.replace(r"<table", f'<table class={custom_classes}')
+
+    report = get_active_report()
+    if report is not None:
+        report.add_html(html_table)
     
     return HTML(html_table)
\ No newline at end of file
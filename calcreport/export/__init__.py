@@ -1,3 +1,3 @@
-from .notebooktohtml import notebook_to_html
+from .notebooktohtml import NotebookToHTML, convert_notebook_to_html
 
-__all__ = ['notebook_to_html']
\ No newline at end of file
+__all__ = ['NotebookToHTML', 'convert_notebook_to_html']
@@ -0,0 +1,134 @@
+import html
+import json
+import os
+import re
+import subprocess
+import warnings
+from pathlib import Path
+from ..cache import CacheStore
+
+RENDER_SCRIPT = Path(__file__).parent / 'scripts' / 'mathjax-render.js'
+
+# mathjax-full names for the TeX packages loaded client-side in templates/js/mathjax-config.js:
+# 'ams' provides both amsmath and amssymb, and configMacros is registered as 'configmacros'
+DEFAULT_PACKAGES = ['base', 'ams', 'newcommand', 'configmacros']
+
+DISPLAY_MATH_PATTERN = re.compile(r'\\\[(.*?)\\\]', re.DOTALL)
+# Any math left that would still need MathJax in the browser
+CLIENT_MATH_PATTERN = re.compile(r'\\\[|\\\(|\$\$|(?<!\\)\$[^$\s][^$]*\$')
+
+class MathEngineUnavailable(RuntimeError):
+    """Node.js or the mathjax-full package could not be run."""
+
+class MathPreRenderer:
+    """
+    Render display math to static SVG at export time with MathJax running in Node.
+
+    Rendered equations are cached on disk, keyed by a hash of the TeX source and the
+    render options, so an equation is only ever rendered once across builds. All
+    equations that miss the cache are rendered in a single Node process.
+
+    Requires Node.js with the mathjax-full package (npm install mathjax-full). If
+    either is missing, a warning is given and all math is left for MathJax to
+    typeset in the browser.
+    """
+
+    def __init__(self, cache_dir=None, packages=None, node='node', node_path=None):
+        """
+        Args:
+            cache_dir: Directory for rendered equations. Defaults to a 'math' folder in
+                the calcreport cache directory.
+            packages: TeX packages to load. Defaults to those in mathjax-config.js.
+            node: Node.js executable.
+            node_path: Directory containing node_modules/mathjax-full, if it is not
+                found from the render script location.
+        """
+        if cache_dir is None:
+            default_root = Path(os.environ.get('CALCREPORT_CACHE_DIR', Path.home() / '.cache' / 'calcreport'))
+            cache_dir = default_root / 'math'
+        self.cache = CacheStore(cache_dir)
+        self.packages = packages or DEFAULT_PACKAGES
+        self.node = node
+        self.node_path = node_path
+        self.options = {'output': 'svg', 'packages': self.packages}
+        self.available = True
+
+    def render(self, equations):
+        """
+        Render a list of TeX strings.
+
+        Returns:
+            (rendered, css) where rendered maps each TeX string to its HTML, or None if it
+            could not be rendered, and css is the stylesheet the SVG output needs
+
+        Raises:
+            MathEngineUnavailable: If Node.js or mathjax-full cannot be run
+        """
+        rendered = {}
+        missing = []
+        for equation in dict.fromkeys(equations):
+            found, value = self.cache.get(self.cache.key('equation', equation, self.options))
+            if found:
+                rendered[equation] = value
+            else:
+                missing.append(equation)
+
+        css_key = self.cache.key('css', self.options)
+        found, css = self.cache.get(css_key)
+        if missing or not found:
+            result = self._run_node(missing)
+            css = result['css']
+            self.cache.set(css_key, css)
+            for equation, value in zip(missing, result['equations']):
+                rendered[equation] = value
+                if value is not None:
+                    self.cache.set(self.cache.key('equation', equation, self.options), value)
+
+        print(f"Math pre-rendering: {len(rendered) - len(missing)} cached, {len(missing)} rendered")
+        return rendered, css
+
+    def _run_node(self, equations):
+        env = dict(os.environ)
+        if self.node_path:
+            env['NODE_PATH'] = str(Path(self.node_path) / 'node_modules')
+        request = json.dumps({'equations': equations, 'packages': self.packages})
+        try:
+            process = subprocess.run(
+                [self.node, str(RENDER_SCRIPT)],
+                input=request, capture_output=True, text=True, encoding='utf-8', env=env
+            )
+        except OSError as e:
+            raise MathEngineUnavailable(f"could not run {self.node}: {e}") from e
+        # Equations that fail to render are reported in the output, a failed process
+        # means Node could not load mathjax-full at all
+        if process.returncode != 0:
+            errors = [line for line in process.stderr.splitlines() if 'Error' in line]
+            raise MathEngineUnavailable(errors[0].strip() if errors else process.stderr.strip())
+        return json.loads(process.stdout)
+
+    def prerender(self, content):
+        """
+        Replace display math in HTML content with pre-rendered SVG.
+
+        Returns:
+            (content, css, needs_client_math) where needs_client_math is True if any math
+            is left for MathJax to typeset in the browser
+        """
+        if not self.available:
+            return content, '', True
+        matches = DISPLAY_MATH_PATTERN.findall(content)
+        # The browser would unescape entities before MathJax reads the TeX
+        try:
+            rendered, css = self.render([html.unescape(tex).strip() for tex in matches])
+        except MathEngineUnavailable as e:
+            # Only warn once per export, later documents go straight to client-side MathJax
+            self.available = False
+            warnings.warn(f"Math pre-rendering unavailable, falling back to MathJax in the browser: {e}")
+            return content, '', True
+
+        def replace(match):
+            value = rendered.get(html.unescape(match.group(1)).strip())
+            return value if value is not None else match.group(0)
+
+        content = DISPLAY_MATH_PATTERN.sub(replace, content)
+        return content, css, bool(CLIENT_MATH_PATTERN.search(content))
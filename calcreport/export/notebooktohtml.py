@@ -13,6 +13,32 @@ python -m http.server 8000
 '''
 
 options = (cmarkgfmOptions.CMARK_OPT_UNSAFE)
+TEMPLATE_DIR = Path(__file__).parent / 'templates'
+
+# Output size budgets in bytes, beyond which cell outputs are summarized
+MAX_CELL_OUTPUT_BYTES = 2 * 1024**2
+MAX_DOCUMENT_OUTPUT_BYTES = 50 * 1024**2
+# Once the document budget is used up, smaller outputs are still kept in full unless they are long tables
+MIN_SUMMARIZED_OUTPUT_BYTES = 64 * 1024
+# Fraction of the document budget those smaller outputs may add, beyond it every output is summarized
+DOCUMENT_OUTPUT_OVERFLOW = 0.1
+# Rows kept from the start and end of a summarized table
+TRUNCATED_TABLE_ROWS = 10
+
+# Column width hints: rows sampled per table and the range of text lengths considered
+WIDTH_HINT_SAMPLE_ROWS = 200
+WIDTH_HINT_MIN_CHARS = 3
+WIDTH_HINT_MAX_CHARS = 40
+
+# MathJax typesets in the browser, then starts paged.js (see templates/js/mathjax-config.js)
+CLIENT_MATH_SCRIPTS = '''<script src="templates/js/mathjax-config.js"></script>
+        <script async src="https://cdn.jsdelivr.net/npm/mathjax@4.0.0-beta.7/tex-mml-chtml.js" id="MathJax-script"></script>'''
+
+# Math is already rendered, so paged.js is started directly once the page has loaded
+PRERENDERED_MATH_SCRIPTS = '''<style id="MJX-SVG-styles">{css}</style>
+        <script>
+            window.addEventListener('load', () => window.PagedPolyfill.preview());
+        </script>'''
 
 DEBUG_MODE = True
 if DEBUG_MODE:
@@ -23,6 +49,14 @@ def debug_print(*args, **kwargs):
         debug_log.append(*args, *kwargs)
         print(*args, **kwargs)
 
+def format_size(size: int) -> str:
+    """Format a size in bytes for build messages, eg 1.5 MB or 12 KB."""
+    if size >= 1024**2:
+        return f"{size / 1024**2:.1f} MB"
+    if size >= 1024:
+        return f"{size / 1024:.0f} KB"
+    return f"{size} bytes"
+
 class NotebookCell:
     def __init__(self, cell_type, source, output, metadata=None, level=None, section_number=None, header_id=None):
         self.cell_type = cell_type  # markdown, code
@@ -33,6 +67,8 @@ class NotebookCell:
         self.section_number = section_number
         self.header_id = header_id
         self.category = None  # cover_page, executive_summary, body, appendix
+        self.chapter = None  # ID of the top-level section or appendix this cell belongs to
+        self.index = None  # Position of the cell in the notebook
 
 class DocumentStructure:
     def __init__(self):
@@ -49,12 +85,33 @@ class DocumentStructure:
         return '.'.join(str(n) for n in current_numbers if n > 0)
 
 class NotebookToHTML:
-    def __init__(self):
+    def __init__(self, prerender_math: bool = False, math_cache_dir: str = None, search_index_path: str = None,
+                 max_cell_output: int = MAX_CELL_OUTPUT_BYTES, max_document_output: int = MAX_DOCUMENT_OUTPUT_BYTES,
+                 min_summarized_output: int = MIN_SUMMARIZED_OUTPUT_BYTES, spill_dir: str = None):
         self.debug_mode = DEBUG_MODE
         self.structure = DocumentStructure()
+        self.max_cell_output = max_cell_output
+        self.max_document_output = max_document_output
+        self.min_summarized_output = min_summarized_output
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self.document_output_size = 0
+        self.truncated_outputs = []
+        self.math_renderer = None
+        if prerender_math:
+            from .mathrender import MathPreRenderer
+            self.math_renderer = MathPreRenderer(cache_dir=math_cache_dir)
+        self.search_index = None
+        self.search_index_path = search_index_path
+        if search_index_path:
+            from .searchindex import SearchIndexBuilder
+            search_index_path = Path(search_index_path)
+            self.search_index = SearchIndexBuilder(
+                search_index_path.with_name(search_index_path.name.replace('.json', '-cache.json'))
+            )
+        self.anchor_files = {}
         
         # Load template once during initialization
-        with open('./templates/report_template.html', 'r') as f:
+        with open(TEMPLATE_DIR / 'report_template.html', 'r') as f:
             print(f"Loading template file...")
             self.template = f.read()
     
@@ -66,16 +123,18 @@ class NotebookToHTML:
         # Initialize section numbering array (index 0 unused for easier level mapping)
         current_numbers = [0] * (self.structure.max_header_level + 1)
         current_category = "body"
+        current_chapter = None
 
         print("\nExtracting document structure...")
         
-        for cell in cells:
+        for index, cell in enumerate(cells):
             nb_cell = NotebookCell(
                 cell_type = cell['cell_type'],
                 source = ''.join(cell['source']),
                 metadata = cell.get('metadata', {}),
                 output = cell.get('outputs', {})
             )
+            nb_cell.index = index
             if cell['cell_type'] == 'markdown':
                 lines = nb_cell.source.split('\n')
                 for line in lines:
@@ -92,6 +151,7 @@ class NotebookToHTML:
                     elif line.startswith('# Appendix'):
                         nb_cell.category = "appendix"
                         self.structure.appendices.append(nb_cell)
+                        current_chapter = f"appendix-{chr(64 + len(self.structure.appendices)).lower()}"
                         break
                     
                     # Process regular headers
@@ -120,6 +180,8 @@ class NotebookToHTML:
                         nb_cell.level = level
                         nb_cell.section_number = section_number
                         nb_cell.header_id = section_id
+                        if level == 1:
+                            current_chapter = section_id
                         
                         # Add to headers list
                         header_info={
@@ -132,6 +194,8 @@ class NotebookToHTML:
                         self.structure.headers.append(header_info)
                         break
                                     
+            nb_cell.chapter = current_chapter
+
             # Add to appropriate content collection
             if nb_cell.category not in ["cover_page", "executive_summary", "appendix"]:
                 self.structure.body_cells.append(nb_cell)
@@ -274,6 +338,8 @@ class NotebookToHTML:
             soup = BeautifulSoup(html, 'html.parser')
             revision_table = soup.find('table')
             
+            # Cover pages without a revision table, eg from Report, leave the space empty
+            revision_table_html = f'<div class="revision-table">{revision_table}</div>' if revision_table else ''
             metadata = self.structure.cover_page.metadata
             return f'''
             <div class="cover-page">
@@ -285,9 +351,7 @@ class NotebookToHTML:
                         <p>Document ID: {metadata.get('docid', '')}</p>
                         </div>
                 </div>
-                <div class="revision-table">  
-                    {revision_table}
-                </div>
+                {revision_table_html}
             </div>
             '''
 
@@ -506,9 +570,17 @@ class NotebookToHTML:
         if len(cell.output) > 0:
             outputs = []
                         
-            for output in cell.output:
+            for output_number, output in enumerate(cell.output):
                 if 'text/html' in output['data']:
                     html_content = ''.join(output['data']['text/html'])
+
+                    # Summarize outputs over budget before any further processing
+                    size = len(html_content.encode('utf-8'))
+                    if size > self.max_cell_output:
+                        html_content = self.limit_output(html_content, size, cell, output_number, 'cell')
+                    elif self.over_document_budget(html_content, size):
+                        html_content = self.limit_output(html_content, size, cell, output_number, 'document')
+                    self.document_output_size += len(html_content.encode('utf-8'))
                     
                     # Clean up MathJax-related content
                     html_content = self.clean_mathjax_content(html_content)
@@ -522,6 +594,89 @@ class NotebookToHTML:
         
         return 
     
+    def over_document_budget(self, html_content: str, size: int) -> bool:
+        """
+        Check whether an output should be summarized to keep within the document budget.
+
+        Past max_document_output, outputs of min_summarized_output bytes or more and long
+        tables are summarized, while smaller outputs such as single equations are kept until
+        they have added DOCUMENT_OUTPUT_OVERFLOW of the budget. Beyond that every output is
+        summarized, so the document size stays bounded.
+        """
+        total = self.document_output_size + size
+        if total <= self.max_document_output:
+            return False
+        return (size >= self.min_summarized_output
+                or html_content.count('<tr') > 2 * TRUNCATED_TABLE_ROWS + 1
+                or total > self.max_document_output * (1 + DOCUMENT_OUTPUT_OVERFLOW))
+
+    def limit_output(self, html_content: str, size: int, cell: NotebookCell, output_number: int,
+                     budget: str = 'cell') -> str:
+        """
+        Replace an oversized cell output with a summary.
+
+        Tables keep their header and the first and last TRUNCATED_TABLE_ROWS rows, with a
+        row count. Other content is replaced by a note. If a spill directory is set, the
+        full output is written there and linked from the summary.
+
+        Args:
+            html_content: Full HTML output
+            size: Size of the output in bytes
+            cell: NotebookCell the output belongs to
+            output_number: Position of the output within the cell
+            budget: Budget that was exceeded, 'cell' or 'document'
+
+        Returns:
+            Summary HTML
+        """
+        limit = self.max_cell_output if budget == 'cell' else self.max_document_output
+        exceeded = f"exceeds the {budget} output budget of {format_size(limit)}"
+        spill_link = ''
+        spill_file = None
+        if self.spill_dir:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            spill_file = self.spill_dir / f"cell-{cell.index}-output-{output_number}.html"
+            with open(spill_file, 'w', encoding='utf-8') as f:
+                f.write(html_content)
+            spill_href = f"{self.spill_dir.name}/{spill_file.name}"
+            spill_link = f' Full output: <a href="{spill_href}">{spill_href}</a>'
+
+        summary = ''
+        total_rows = None
+        table_start = html_content.find('<table')
+        if table_start != -1:
+            table_end = html_content.find('</table>', table_start)
+            table_end = len(html_content) if table_end == -1 else table_end
+            table_html = html_content[table_start:table_end]
+            thead_match = re.search(r'<thead\b.*?</thead>', table_html, re.DOTALL)
+            body_start = thead_match.end() if thead_match else 0
+            rows = [m.group(0) for m in re.finditer(r'<tr\b.*?</tr>', table_html[body_start:], re.DOTALL)]
+            total_rows = len(rows)
+
+            if total_rows > 2 * TRUNCATED_TABLE_ROWS:
+                columns = len(re.findall(r'<t[hd]\b', rows[0]))
+                omitted = total_rows - 2 * TRUNCATED_TABLE_ROWS
+                rows = (rows[:TRUNCATED_TABLE_ROWS]
+                        + [f'<tr class="truncated-rows"><td colspan="{columns}">... {omitted} rows omitted ...</td></tr>']
+                        + rows[-TRUNCATED_TABLE_ROWS:])
+            table_tag = re.match(r'<table\b[^>]*>', table_html).group(0)
+            summary = '\n'.join([table_tag, thead_match.group(0) if thead_match else '',
+                                 '<tbody>', *rows, '</tbody>', '</table>'])
+            note = f"Table truncated: {total_rows} rows, {format_size(size)} of output {exceeded}."
+        else:
+            note = f"Output omitted: {format_size(size)} {exceeded}."
+
+        self.truncated_outputs.append({
+            'cell': cell.index,
+            'output': output_number,
+            'size': size,
+            'budget': budget,
+            'rows': total_rows,
+            'spill_file': str(spill_file) if spill_file else None,
+        })
+        print(f"Cell {cell.index} output {output_number} truncated ({format_size(size)}, {budget} budget)")
+        return f'<p class="output-truncated">{note}{spill_link}</p>\n{summary}'
+
     def clean_mathjax_content(self, html_content: str) -> str:
         """
         Clean MathJax-related scripts and unnecessary content from HTML.
@@ -578,18 +733,76 @@ class NotebookToHTML:
             print(*args, **kwargs)
             debug_log.append(*args, *kwargs)
 
+    def load_notebook(self, notebook_path: str) -> dict:
+        """Read a Jupyter notebook file."""
+        print(f"Reading notebook file: {notebook_path}")
+        with open(notebook_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def process_body_cells(self, figure_refs: dict) -> list:
+        """
+        Process the body cells of the document.
+
+        Args:
+            figure_refs: Dictionary mapping figure IDs to their numbers
+
+        Returns:
+            List of (NotebookCell, html) tuples for cells that produce content
+        """
+        content = []
+        for cell in self.structure.body_cells:
+            if cell.cell_type == 'markdown':
+                processed_content = self.process_markdown_cell(cell, figure_refs)
+            elif cell.cell_type == 'code':
+                processed_content = self.process_code_cell(cell, figure_refs)
+            else:
+                processed_content = None
+            if processed_content:
+                content.append((cell, processed_content))
+
+        if self.search_index:
+            self.index_cells(content)
+        return content
+
+    def index_cells(self, content: list):
+        """
+        Add processed cells to the search index, tracking the section each cell belongs to.
+
+        Args:
+            content: List of (NotebookCell, html) tuples from process_body_cells
+        """
+        anchor = ''
+        current_chapter = None
+        for cell, html in content:
+            if cell.chapter != current_chapter:
+                current_chapter = cell.chapter
+                anchor = cell.chapter or ''
+            if cell.header_id:
+                anchor = cell.header_id
+            self.search_index.add_cell(html, anchor)
+
     def convert_notebook(self, notebook_path: str) -> str:
         """Convert Jupyter notebook to HTML."""
         # Read the notebook file
-        print(f"Reading notebook file: {notebook_path}")
-        with open(notebook_path, 'r', encoding='utf-8') as f:
-            notebook = json.load(f)
+        notebook = self.load_notebook(notebook_path)
+        return self.convert_cells(notebook['cells'])
+
+    def convert_cells(self, cells: list) -> str:
+        """
+        Convert notebook-format cells to HTML.
 
+        Args:
+            cells: List of cell dictionaries in notebook format, either read from
+                an .ipynb file or built in-process by calcreport.Report.
+
+        Returns:
+            HTML document
+        """
         # First pass: collect all figure IDs and assign numbers
-        figure_refs = self.collect_figure_references(notebook['cells']) 
+        figure_refs = self.collect_figure_references(cells) 
 
         # Extract document structure
-        self.extract_structure(notebook['cells'])
+        self.extract_structure(cells)
 
         # Generate document components
         cover_page = self.generate_cover_page()
@@ -599,18 +812,7 @@ class NotebookToHTML:
         
 
         # Process body content
-        content = []
-        cell_counter = 1
-        for cell in self.structure.body_cells:
-            if cell.cell_type == 'markdown':
-                processed_content = self.process_markdown_cell(cell, figure_refs)
-                content.append(processed_content)
-                cell_counter += 1
-            elif cell.cell_type == 'code':
-                processed_content = self.process_code_cell(cell, figure_refs)
-                if processed_content:
-                    content.append(processed_content)
-                    cell_counter += 1
+        content = [html for _, html in self.process_body_cells(figure_refs)]
 
         # Process appendix content
         appendix_pages = self.generate_appendix_pages()
@@ -627,41 +829,277 @@ class NotebookToHTML:
         self.debug_print(f"Final content: {final_content}")
         return self._create_html_document(final_content)
 
+    def convert_notebook_chapters(self, notebook_path: str, basename: str, full_build: str = None) -> dict:
+        """
+        Convert a Jupyter notebook to a lightweight index page plus one HTML document
+        per top-level section and per appendix.
+
+        The index carries the cover page, executive summary and table of contents.
+        Links to anchors that live in another file are rewritten to point at that file.
+
+        Args:
+            notebook_path: Path to the input .ipynb file.
+            basename: Stem used to name the chapter files, eg 'report' gives 'report-s1.html'.
+            full_build: Optional filename of a single-file build to link from the index.
+
+        Returns:
+            Dictionary mapping filenames to HTML documents, index page first
+        """
+        notebook = self.load_notebook(notebook_path)
+        figure_refs = self.collect_figure_references(notebook['cells'])
+        self.extract_structure(notebook['cells'])
+
+        header_footer = self.generate_header_footer()
+        index_filename = f"{basename}.html"
+
+        # One file per top-level section and per appendix, in document order
+        chapters = {}
+        for header in self.structure.headers:
+            if header['level'] == 1 and header['category'] != 'appendix':
+                chapters[header['id']] = []
+        appendix_pages = self.generate_appendix_pages()
+        for i, appendix_page in enumerate(appendix_pages):
+            chapters[f"appendix-{chr(97 + i)}"] = [appendix_page]
+
+        # Cells before the first top-level section stay on the index page
+        front_matter = []
+        for cell, html in self.process_body_cells(figure_refs):
+            chapters.get(cell.chapter, front_matter).append(html)
+
+        if full_build:
+            front_matter.insert(0,
+                f'<p class="full-build-link">Complete document for printing: '
+                f'<a href="{full_build}">{full_build}</a></p>'
+            )
+
+        pages = {
+            index_filename: '\n'.join(filter(None, [
+                header_footer,
+                self.generate_cover_page(),
+                self.generate_executive_summary(),
+                self.generate_toc_html(),
+                '\n'.join(front_matter)
+            ]))
+        }
+        for chapter_id, content in chapters.items():
+            pages[f"{basename}-{chapter_id}.html"] = '\n'.join([header_footer] + content)
+
+        pages = self.link_pages(pages)
+        return {filename: self._create_html_document(content) for filename, content in pages.items()}
+
+    def link_pages(self, pages: dict) -> dict:
+        """
+        Rewrite in-page anchor links that target an ID defined in another page.
+
+        Args:
+            pages: Dictionary mapping filenames to HTML content
+
+        Returns:
+            Dictionary mapping filenames to HTML content with cross-file links
+        """
+        anchor_files = {}
+        for filename, content in pages.items():
+            for anchor_id in re.findall(r'\bid="([^"]+)"', content):
+                anchor_files.setdefault(anchor_id, filename)
+
+        def relink(filename, content):
+            def replace(match):
+                target = anchor_files.get(match.group(1))
+                if target is None or target == filename:
+                    return match.group(0)
+                return f'href="{target}#{match.group(1)}"'
+            return re.sub(r'href="#([^"]+)"', replace, content)
+
+        self.anchor_files = anchor_files
+        return {filename: relink(filename, content) for filename, content in pages.items()}
+
+    def add_column_width_hints(self, content: str) -> str:
+        """
+        Add explicit column widths to every table, computed from the table's text.
+
+        Each column gets a share of the table width proportional to the longest text
+        in it (header included), clamped to WIDTH_HINT_MIN_CHARS..WIDTH_HINT_MAX_CHARS,
+        with a minimum of 5% like paged-js-repeat-table-header.js. The widths are
+        emitted as a colgroup and as a data-col-widths attribute, which the paged.js
+        handler uses instead of measuring the table in the browser.
+
+        Args:
+            content: HTML content
+        
+        Returns:
+            HTML content with width hints on its tables
+        """
+        def hint(match):
+            table_html = match.group(0)
+            table_tag = match.group(1)
+            if 'data-col-widths' in table_tag or '<colgroup' in table_html:
+                return table_html
+
+            widths = []
+            rows = re.finditer(r'<tr\b.*?</tr>', table_html, re.DOTALL)
+            for row_number, row in enumerate(rows):
+                if row_number >= WIDTH_HINT_SAMPLE_ROWS:
+                    break
+                if 'colspan' in row.group(0):
+                    # Spanning cells say nothing about individual column widths
+                    continue
+                cells = re.findall(r'<t[hd]\b[^>]*>(.*?)</t[hd]>', row.group(0), re.DOTALL)
+                for column, cell in enumerate(cells):
+                    text = re.sub(r'\s+', ' ', re.sub(r'<[^>]+>', '', cell)).strip()
+                    length = min(max(len(text), WIDTH_HINT_MIN_CHARS), WIDTH_HINT_MAX_CHARS)
+                    if column < len(widths):
+                        widths[column] = max(widths[column], length)
+                    else:
+                        widths.append(length)
+            if not widths:
+                return table_html
+
+            total = sum(widths)
+            percentages = [f"{max(5, width / total * 100):.2f}%" for width in widths]
+            colgroup = '<colgroup>' + ''.join(f'<col style="width: {width}">' for width in percentages) + '</colgroup>'
+            return f'{table_tag[:-1]} data-col-widths="{",".join(percentages)}">{colgroup}{table_html[len(table_tag):]}'
+
+        return re.sub(r'(<table\b[^>]*>).*?</table>', hint, content, flags=re.DOTALL)
+
     def _create_html_document(self, content: str) -> str:
         """Create the HTML document using the template."""
-        return self.template.format(content=content)
+        content = self.add_column_width_hints(content)
+        math_scripts = CLIENT_MATH_SCRIPTS
+        if self.math_renderer:
+            content, css, needs_client_math = self.math_renderer.prerender(content)
+            math_scripts = PRERENDERED_MATH_SCRIPTS.format(css=css)
+            if needs_client_math and not css:
+                # Nothing was pre-rendered, MathJax typesets everything in the browser
+                math_scripts = CLIENT_MATH_SCRIPTS
+            elif needs_client_math:
+                # Some math could not be pre-rendered, let MathJax typeset what is left
+                math_scripts = f"<style id=\"MJX-SVG-styles\">{css}</style>\n        {CLIENT_MATH_SCRIPTS}"
+        head_extra = ''
+        if self.search_index:
+            # Deferred so it runs after paged.polyfill.js has defined Paged
+            head_extra = f'<script src="templates/js/search.js" data-index="{Path(self.search_index_path).name}" defer></script>'
+        return self.template.format(content=content, math_scripts=math_scripts, head_extra=head_extra)
 
-def convert_notebook_to_html(notebook_path: str, output_path: str):
+def convert_notebook_to_html(notebook_path: str, output_path: str, split_chapters: bool = False, full_build: bool = True,
+                             prerender_math: bool = False, math_cache_dir: str = None, search_index: bool = False,
+                             max_cell_output: int = MAX_CELL_OUTPUT_BYTES, max_document_output: int = MAX_DOCUMENT_OUTPUT_BYTES,
+                             min_summarized_output: int = MIN_SUMMARIZED_OUTPUT_BYTES, spill_outputs: bool = False):
     """
     Convert a Jupyter notebook to a formatted HTML document.
     
     Args:
         notebook_path: Path to the input .ipynb file.
         output_path: Path where the HTML file should be saved.
+        split_chapters: Write each top-level section and appendix to its own file,
+            with output_path as the index page.
+        full_build: When splitting, also write the complete single-file document
+            alongside the chapters for printing.
+        prerender_math: Render display math to static SVG at export time so the browser
+            skips MathJax typesetting. Requires Node.js with mathjax-full.
+        math_cache_dir: Directory for cached pre-rendered equations.
+        search_index: Write a prebuilt search index next to the output, <stem>.search.json,
+            and add a search widget to the page. Rebuilds only re-index changed cells.
+        max_cell_output: Size in bytes above which a single cell output is summarized.
+        max_document_output: Total size in bytes of cell outputs, beyond which further
+            long tables and outputs of min_summarized_output bytes or more are summarized.
+            Smaller outputs may exceed it by DOCUMENT_OUTPUT_OVERFLOW of the budget, after
+            that every output is summarized.
+        min_summarized_output: Size in bytes below which outputs are kept in full once
+            max_document_output is reached, until the overflow is used up.
+        spill_outputs: Write the full content of summarized outputs to <stem>-outputs/
+            and link to it from the summary.
     """
-    converter = NotebookToHTML()
-    
-    html_content = converter.convert_notebook(notebook_path)
-    html_content = BeautifulSoup(html_content, 'html.parser').prettify()
-    
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
-        print(f"HTML document saved to: {output_path} \n start a http server with: python -m http.server 8000, then browse to http://localhost:8000/ to view the document")
+    output_path = Path(output_path)
+    search_index_path = output_path.with_name(f"{output_path.stem}.search.json") if search_index else None
+    output_options = {
+        'max_cell_output': max_cell_output,
+        'max_document_output': max_document_output,
+        'min_summarized_output': min_summarized_output,
+        'spill_dir': output_path.with_name(f"{output_path.stem}-outputs") if spill_outputs else None,
+    }
+    if not split_chapters:
+        converter = NotebookToHTML(prerender_math=prerender_math, math_cache_dir=math_cache_dir,
+                                   search_index_path=search_index_path, **output_options)
+        
+        html_content = converter.convert_notebook(notebook_path)
+        html_content = BeautifulSoup(html_content, 'html.parser').prettify()
+        
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(html_content)
+            print(f"HTML document saved to: {output_path} \n start a http server with: python -m http.server 8000, then browse to http://localhost:8000/ to view the document")
+        if search_index:
+            converter.search_index.save(search_index_path)
+        write_build_report(converter, output_path)
+        return
+
+    full_build_name = None
+    if full_build:
+        full_build_name = f"{output_path.stem}-full.html"
+        convert_notebook_to_html(notebook_path, output_path.with_name(full_build_name),
+                                 prerender_math=prerender_math, math_cache_dir=math_cache_dir,
+                                 search_index=search_index, max_cell_output=max_cell_output,
+                                 max_document_output=max_document_output, min_summarized_output=min_summarized_output,
+                                 spill_outputs=spill_outputs)
+
+    converter = NotebookToHTML(prerender_math=prerender_math, math_cache_dir=math_cache_dir,
+                               search_index_path=search_index_path, **output_options)
+    pages = converter.convert_notebook_chapters(notebook_path, output_path.stem, full_build_name)
+    for filename, html_content in pages.items():
+        html_content = BeautifulSoup(html_content, 'html.parser').prettify()
+        with open(output_path.with_name(filename), 'w', encoding='utf-8') as f:
+            f.write(html_content)
+        print(f"HTML document saved to: {output_path.with_name(filename)}")
+    if search_index:
+        converter.search_index.save(search_index_path, converter.anchor_files, output_path.name)
+    write_build_report(converter, output_path)
+    print(f"Index page: {output_path} \n start a http server with: python -m http.server 8000, then browse to http://localhost:8000/ to view the document")
+
+def write_build_report(converter: NotebookToHTML, output_path: Path):
+    """Write <stem>.build-report.json listing truncated cell outputs, or remove a stale one if there were none."""
+    report_path = output_path.with_name(f"{output_path.stem}.build-report.json")
+    if not converter.truncated_outputs:
+        report_path.unlink(missing_ok=True)
+        return
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump({'truncated_outputs': converter.truncated_outputs}, f, indent=2)
+    print(f"{len(converter.truncated_outputs)} cell outputs truncated, see: {report_path}")
 
 # Main function to handle command-line arguments
 def main():
     parser = argparse.ArgumentParser(description="Convert a Jupyter notebook to a formatted HTML document.")
     parser.add_argument("notebook_path", help="Path to the input .ipynb file.")
     parser.add_argument("output_path", help="Path where the HTML file should be saved.")
+    parser.add_argument("--split-chapters", action="store_true",
+                        help="Write each top-level section and appendix to its own file, with output_path as the index.")
+    parser.add_argument("--no-full-build", action="store_true",
+                        help="With --split-chapters, skip writing the complete single-file document.")
+    parser.add_argument("--prerender-math", action="store_true",
+                        help="Render display math to SVG at export time (requires Node.js with mathjax-full).")
+    parser.add_argument("--math-cache-dir", help="Directory for cached pre-rendered equations.")
+    parser.add_argument("--search-index", action="store_true",
+                        help="Write a prebuilt search index and add a search widget to the report.")
+    parser.add_argument("--max-cell-output", type=int, default=MAX_CELL_OUTPUT_BYTES,
+                        help="Size in bytes above which a cell output is summarized.")
+    parser.add_argument("--max-document-output", type=int, default=MAX_DOCUMENT_OUTPUT_BYTES,
+                        help="Total size in bytes of cell outputs beyond which further large outputs are summarized.")
+    parser.add_argument("--min-summarized-output", type=int, default=MIN_SUMMARIZED_OUTPUT_BYTES,
+                        help="Size in bytes below which outputs past the document budget are kept, up to 10%% over it.")
+    parser.add_argument("--spill-outputs", action="store_true",
+                        help="Keep the full content of summarized outputs in a side folder.")
     
     args = parser.parse_args()
     
-    convert_notebook_to_html(args.notebook_path, args.output_path)
+    convert_notebook_to_html(args.notebook_path, args.output_path,
+                             split_chapters=args.split_chapters, full_build=not args.no_full_build,
+                             prerender_math=args.prerender_math, math_cache_dir=args.math_cache_dir,
+                             search_index=args.search_index, max_cell_output=args.max_cell_output,
+                             max_document_output=args.max_document_output,
+                             min_summarized_output=args.min_summarized_output, spill_outputs=args.spill_outputs)
 
 if __name__ == "__main__":
     main()
 
-if DEBUG_MODE:
-    with open("debug.log", "w") as f:
-        for item in debug_log:
-            f.write(f"{item}\n")
\ No newline at end of file
+    if DEBUG_MODE:
+        with open("debug.log", "w") as f:
+            for item in debug_log:
+                f.write(f"{item}\n")
\ No newline at end of file
@@ -0,0 +1,37 @@
+// Render TeX to static SVG with MathJax in Node, used by the exporter to pre-render equations.
+// Reads {"equations": [tex, ...], "packages": [...]} as JSON on stdin and writes
+// {"equations": [html or null, ...], "css": stylesheet} as JSON to stdout.
+// Requires the mathjax-full package: npm install mathjax-full
+const {mathjax} = require('mathjax-full/js/mathjax.js');
+const {TeX} = require('mathjax-full/js/input/tex.js');
+const {SVG} = require('mathjax-full/js/output/svg.js');
+const {liteAdaptor} = require('mathjax-full/js/adaptors/liteAdaptor.js');
+const {RegisterHTMLHandler} = require('mathjax-full/js/handlers/html.js');
+require('mathjax-full/js/input/tex/AllPackages.js');
+
+let input = '';
+process.stdin.setEncoding('utf8');
+process.stdin.on('data', chunk => { input += chunk; });
+process.stdin.on('end', () => {
+    const request = JSON.parse(input);
+    const adaptor = liteAdaptor();
+    RegisterHTMLHandler(adaptor);
+
+    // Throw on TeX errors so a bad equation is left for client-side typesetting
+    const tex = new TeX({packages: request.packages, formatError: (jax, err) => { throw err; }});
+    // fontCache 'none' keeps every equation self-contained so each can be cached on its own
+    const svg = new SVG({fontCache: 'none'});
+    const html = mathjax.document('', {InputJax: tex, OutputJax: svg});
+
+    const equations = request.equations.map(equation => {
+        try {
+            return adaptor.outerHTML(html.convert(equation, {display: true}));
+        } catch (err) {
+            console.error(`Failed to render: ${equation}\n${err}`);
+            return null;
+        }
+    });
+
+    const css = adaptor.textContent(svg.styleSheet(html));
+    process.stdout.write(JSON.stringify({equations, css}));
+});
@@ -0,0 +1,144 @@
+import hashlib
+import json
+import re
+from pathlib import Path
+from bs4 import BeautifulSoup
+
+# Bump when the entry format changes to discard cached entries
+INDEX_VERSION = 2
+
+# Entry kinds, in the order results are ranked
+KINDS = ['section', 'variable', 'figure', 'text']
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9_]{2,}')
+EQUATION_LHS_PATTERN = re.compile(r'\\\[\s*(.*?)\s*=', re.DOTALL)
+SNIPPET_LENGTH = 120
+
+def tokenize(text):
+    """Split text into lowercase search terms."""
+    text = text.lower()
+    return sorted(set(TOKEN_PATTERN.findall(text)) | set(TOKEN_PATTERN.findall(text.replace('_', ' '))))
+
+def variable_terms(name):
+    """Search terms for a variable name, including single letters such as P or L, which tokenize skips."""
+    name = name.lower()
+    return {name} | {part for part in name.split('_') if part}
+
+def latex_to_name(latex):
+    """Turn a variable name formatted by format_var_name back into plain text, eg sigma_max."""
+    name = re.sub(r'\\text\{([^}]*)\}', r'\1', latex)
+    name = re.sub(r'\\([A-Za-z]+)', r'\1', name)
+    return re.sub(r'[{}\s\\]', '', name)
+
+def cell_key(html_content, anchor):
+    """Hash of a processed cell, used to reuse its entries when it has not changed."""
+    return hashlib.sha256(f"{INDEX_VERSION}\0{anchor}\0{html_content}".encode('utf-8')).hexdigest()
+
+class SearchIndexBuilder:
+    """
+    Build a compact inverted search index for an exported report.
+
+    The index covers section titles, figure captions, paragraph text and the
+    variable names of displayed equations. Entries are extracted per processed cell
+    and cached next to the index keyed by a hash of the cell's HTML, so a rebuild
+    only parses cells that changed.
+    """
+
+    def __init__(self, cache_path=None):
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.cache = {}
+        if self.cache_path and self.cache_path.exists():
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('version') == INDEX_VERSION:
+                self.cache = cached['cells']
+        self.used = {}
+        self.entries = []
+        self.reused = 0
+        self.extracted = 0
+
+    def add_cell(self, html_content, anchor):
+        """
+        Add the entries of one processed cell.
+
+        Args:
+            html_content: Processed HTML of the cell
+            anchor: ID of the section the cell belongs to, used as the target of
+                entries without an anchor of their own
+        """
+        key = cell_key(html_content, anchor)
+        entries = self.cache.get(key)
+        if entries is None:
+            entries = self.extract_entries(html_content, anchor)
+            self.extracted += 1
+        else:
+            self.reused += 1
+        self.used[key] = entries
+        self.entries.extend(entries)
+
+    def extract_entries(self, html_content, anchor):
+        """Extract [kind, title, anchor, snippet, terms] entries from a processed cell."""
+        soup = BeautifulSoup(html_content, 'html.parser')
+        entries = []
+
+        for header in soup.find_all(re.compile(r'^h[1-6]$')):
+            title = header.get_text(' ', strip=True)
+            entries.append(['section', title, header.get('id', anchor), '', tokenize(title)])
+
+        for figure in soup.find_all('figure'):
+            caption = figure.find('figcaption')
+            if caption:
+                title = caption.get_text(' ', strip=True)
+                entries.append(['figure', title, figure.get('id', anchor), '', tokenize(title)])
+
+        for math in soup.find_all(class_='math'):
+            equation = math.find(class_='math-equation')
+            lhs_match = EQUATION_LHS_PATTERN.search(equation.get_text() if equation else '')
+            if lhs_match:
+                name = latex_to_name(lhs_match.group(1))
+                comment = math.find(class_='math-comment')
+                snippet = comment.get_text(' ', strip=True)[:SNIPPET_LENGTH] if comment else ''
+                terms = sorted(set(tokenize(f"{name} {snippet}")) | variable_terms(name))
+                entries.append(['variable', name, anchor, snippet, terms])
+
+        for paragraph in soup.find_all(['p', 'li']):
+            text = paragraph.get_text(' ', strip=True)
+            if text:
+                entries.append(['text', text[:SNIPPET_LENGTH], anchor, text[:SNIPPET_LENGTH], tokenize(text)])
+
+        return entries
+
+    def build(self, anchor_files=None, default_page=''):
+        """
+        Build the index.
+
+        Args:
+            anchor_files: Optional mapping of anchor IDs to the file that defines them,
+                for reports split across several files.
+            default_page: File that entries without an anchor link to.
+
+        Returns:
+            Dictionary with 'kinds', 'docs' ([kind, title, href, snippet]) and 'terms'
+            (term -> list of doc numbers)
+        """
+        anchor_files = anchor_files or {}
+        docs = []
+        terms = {}
+        for kind, title, anchor, snippet, entry_terms in self.entries:
+            href = f"{anchor_files.get(anchor, default_page)}#{anchor}" if anchor else default_page
+            docs.append([KINDS.index(kind), title, href, snippet])
+            for term in entry_terms:
+                terms.setdefault(term, []).append(len(docs) - 1)
+        return {'version': INDEX_VERSION, 'kinds': KINDS, 'docs': docs, 'terms': dict(sorted(terms.items()))}
+
+    def save(self, index_path, anchor_files=None, default_page=''):
+        """Write the index, and the per-cell cache for the next incremental build."""
+        index = self.build(anchor_files, default_page)
+        with open(index_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, separators=(',', ':'))
+        if self.cache_path:
+            # Only keep cells that are still in the document
+            with open(self.cache_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': INDEX_VERSION, 'cells': self.used}, f, separators=(',', ':'))
+        print(f"Search index saved to: {index_path} ({len(index['docs'])} entries, "
+              f"{self.extracted} cells indexed, {self.reused} reused)")
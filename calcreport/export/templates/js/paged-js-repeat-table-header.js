@@ -15,6 +15,13 @@ class RepeatTableHeadersHandler extends Paged.Handler {
         tables.forEach((table, index) => {
             // Generate a temporary ID if none exists
             const tempId = `table-${index}`;
+
+            // Widths computed at export time, the colgroup is already in place
+            if (table.dataset.colWidths) {
+                this.tableWidths.set(tempId, table.dataset.colWidths.split(','));
+                table.dataset.tempId = tempId;
+                return;
+            }
             console.log(`Initial processing of table ${tempId}`);
             
             // Store original styling
@@ -129,6 +136,10 @@ class RepeatTableHeadersHandler extends Paged.Handler {
 
     // Called when Paged.js starts processing a table
     processTable(table) {
+        if (table.dataset.colWidths) {
+            this.tableWidths.set(table.dataset.ref, table.dataset.colWidths.split(','))
+            return
+        }
         if (!this.tableWidths.has(table.dataset.ref)) {
             console.log(`Initial processing of table ${table.dataset.ref}`)
             const widths = this.calculateOptimalColumnWidths(table)
@@ -236,6 +247,13 @@ class RepeatTableHeadersHandler extends Paged.Handler {
     } 
  
     applyWidths(table, widths, identifier) {
+        // Export-time hints already provide a matching colgroup, keep it as is
+        if (table.dataset.colWidths && table.querySelector('colgroup')) {
+            if (!table.classList.contains('markdown-cell')) {
+                table.classList.add('markdown-cell');
+            }
+            return;
+        }
         console.log(`Applying widths to table ${identifier}:`, widths);
         
         // Remove any existing colgroup
@@ -0,0 +1,85 @@
+// Search widget for exported reports.
+// Queries the prebuilt index named in the script tag's data-index attribute,
+// so searching never walks the paginated DOM.
+(() => {
+    const script = document.currentScript;
+    const indexUrl = script.dataset.index;
+    const maxResults = 20;
+    let index = null;
+
+    function loadIndex() {
+        if (!index) {
+            index = fetch(indexUrl).then(response => response.json());
+        }
+        return index;
+    }
+
+    function search(data, query) {
+        const tokens = query.toLowerCase().match(/[a-z0-9_]+/g);
+        if (!tokens) return [];
+
+        // Every token must match the start of at least one term of a result.
+        // Single characters only match exactly, which finds variables such as P or L.
+        let matches = null;
+        tokens.forEach(token => {
+            const docs = new Map();
+            for (const term in data.terms) {
+                if (token.length === 1 ? term === token : term.startsWith(token)) {
+                    data.terms[term].forEach(doc => docs.set(doc, (docs.get(doc) || 0) + (term === token ? 2 : 1)));
+                }
+            }
+            if (matches === null) {
+                matches = docs;
+            } else {
+                matches = new Map([...matches].filter(([doc]) => docs.has(doc)).map(([doc, score]) => [doc, score + docs.get(doc)]));
+            }
+        });
+
+        return [...matches]
+            .sort((a, b) => b[1] - a[1] || data.docs[a[0]][0] - data.docs[b[0]][0])
+            .slice(0, maxResults)
+            .map(([doc]) => data.docs[doc]);
+    }
+
+    function createWidget() {
+        const widget = document.createElement('div');
+        widget.className = 'search-widget';
+        widget.innerHTML = '<input type="search" placeholder="Search report"><ol class="search-results"></ol>';
+        const input = widget.querySelector('input');
+        const results = widget.querySelector('.search-results');
+
+        input.addEventListener('input', () => {
+            loadIndex().then(data => {
+                results.innerHTML = '';
+                search(data, input.value).forEach(([kind, title, href, snippet]) => {
+                    const item = document.createElement('li');
+                    const link = document.createElement('a');
+                    link.href = href;
+                    link.textContent = title;
+                    item.className = `search-${data.kinds[kind]}`;
+                    item.appendChild(link);
+                    if (snippet && snippet !== title) {
+                        const detail = document.createElement('div');
+                        detail.className = 'search-snippet';
+                        detail.textContent = snippet;
+                        item.appendChild(detail);
+                    }
+                    results.appendChild(item);
+                });
+            });
+        });
+        document.body.appendChild(widget);
+    }
+
+    if (window.Paged) {
+        // Paged.js replaces the body content, add the widget once pages are rendered
+        class SearchWidgetHandler extends Paged.Handler {
+            afterRendered() {
+                createWidget();
+            }
+        }
+        Paged.registerHandlers(SearchWidgetHandler);
+    } else {
+        document.addEventListener('DOMContentLoaded', createWidget);
+    }
+})();
@@ -0,0 +1,234 @@
+import inspect
+import numpy as np
+import sympy as sp
+from .display import format_equation, format_value, render_content, debug_print
+from .units import u
+
+class CalcGraph:
+    """
+    Opt-in dependency graph of calculation variables with selective recomputation.
+
+    Each variable is a node named after the Python variable passed to
+    CalcGraph.displaymath, the same name displaymath captures. A node defined by a
+    SymPy expression depends on the nodes named by the expression's free symbols.
+    Changing an input marks everything downstream dirty, and recompute() evaluates
+    and re-renders only those nodes, updating their displayed equations in place.
+
+    Usage:
+        graph = CalcGraph()
+        P, A = sp.symbols('P A')
+        graph.input('P', Q_(10, u.kN))
+        graph.input('A', Q_(0.2, u.m**2))
+        sigma = P / A
+        graph.displaymath(sigma, comment='Axial stress')
+        graph.set('P', Q_(12, u.kN))  # recomputes and re-renders sigma only
+    """
+
+    def __init__(self, auto_update=True):
+        self.auto_update = auto_update
+        self.nodes = {}
+
+    def __getitem__(self, name):
+        return self.value(name)
+
+    def input(self, name, value, comment='', show=True, **display_options):
+        """Define an input variable with a numeric or Quantity value."""
+        self._define(name, None, value, comment, show, display_options)
+        return value
+
+    def define(self, name, expr, comment='', show=True, **display_options):
+        """
+        Define a calculated variable from a SymPy expression.
+
+        Free symbols of the expression that name other nodes become dependencies,
+        other symbols are left symbolic.
+
+        Returns:
+            The evaluated value
+        """
+        self._define(name, sp.sympify(expr), None, comment, show, display_options)
+        return self.nodes[name]['value']
+
+    def displaymath(self, expr, comment='', **display_options):
+        """
+        Define and display a variable, named after the variable passed in like displaymath.
+
+        SymPy expressions become calculated nodes, any other value becomes an input.
+        """
+        frame = inspect.currentframe().f_back
+        var_name = [name for name, val in frame.f_locals.items() if val is expr][0]
+        debug_print(f"Captured variable name: {var_name}")
+        if isinstance(expr, sp.Basic):
+            return self.define(var_name, expr, comment, **display_options)
+        return self.input(var_name, expr, comment, **display_options)
+
+    def set(self, name, value):
+        """Change the value of an input and mark everything that depends on it dirty."""
+        node = self.nodes[name]
+        if node['expr'] is not None:
+            raise ValueError(f"'{name}' is calculated from an expression, it cannot be set directly")
+        if self._same_value(node['value'], value):
+            return
+        node['value'] = value
+        self._render(name)
+        self._mark_dirty(name)
+        if self.auto_update:
+            self.recompute()
+
+    def value(self, name):
+        """Return the current value of a variable, recomputing it first if it is dirty."""
+        if self.nodes[name]['dirty']:
+            self.recompute()
+        return self.nodes[name]['value']
+
+    def dirty(self):
+        """Return the names of variables waiting to be recomputed."""
+        return [name for name, node in self.nodes.items() if node['dirty']]
+
+    def recompute(self):
+        """
+        Recompute dirty variables in dependency order and update their displayed equations.
+
+        Returns:
+            Names of the variables that were recomputed
+        """
+        recomputed = []
+        for name in self._ordered(self.dirty()):
+            node = self.nodes[name]
+            node['value'] = self._evaluate(node)
+            node['dirty'] = False
+            self._render(name)
+            recomputed.append(name)
+        return recomputed
+
+    def dependencies(self, name):
+        """Return every variable the given variable depends on, directly or indirectly."""
+        found = set()
+        pending = list(self.nodes[name]['depends_on'])
+        while pending:
+            current = pending.pop()
+            if current not in found:
+                found.add(current)
+                pending.extend(self.nodes[current]['depends_on'])
+        return self._ordered(found)
+
+    def dependents(self, name):
+        """Return every variable that depends on the given variable, directly or indirectly."""
+        found = set()
+        pending = [name]
+        while pending:
+            current = pending.pop()
+            for other, node in self.nodes.items():
+                if current in node['depends_on'] and other not in found:
+                    found.add(other)
+                    pending.append(other)
+        return self._ordered(found)
+
+    def _define(self, name, expr, value, comment, show, display_options):
+        depends_on = set()
+        function = None
+        if expr is not None:
+            depends_on = {str(symbol) for symbol in expr.free_symbols if str(symbol) in self.nodes}
+
+        existing = self.nodes.get(name)
+        if existing and self._same_definition(existing, expr, value, depends_on, comment, show, display_options):
+            # Re-running an unchanged definition, eg on Run All, leaves the graph as it is
+            return
+
+        if expr is not None:
+            if name in depends_on or any(name in self.dependencies(dep) for dep in depends_on):
+                raise ValueError(f"Defining '{name}' this way would make it depend on itself")
+            symbols = sorted((symbol for symbol in expr.free_symbols if str(symbol) in depends_on), key=str)
+            # Compile once, re-evaluation only calls the compiled function
+            function = (symbols, sp.lambdify(symbols, expr, modules='numpy'))
+
+        self.nodes[name] = {
+            'expr': expr,
+            'value': value,
+            'function': function,
+            'depends_on': depends_on,
+            'dirty': expr is not None,
+            'comment': comment,
+            'show': show,
+            'display_options': display_options,
+            'display_id': existing['display_id'] if existing else None,
+        }
+        if existing:
+            # Re-running a definition keeps its display, it is updated rather than repeated
+            if expr is None:
+                self._render(name)
+            self._mark_dirty(name)
+            if self.auto_update:
+                self.recompute()
+        else:
+            if expr is not None:
+                self.nodes[name]['value'] = self._evaluate(self.nodes[name])
+                self.nodes[name]['dirty'] = False
+            self._render(name)
+
+    def _evaluate(self, node):
+        if node['function'] is None:
+            return node['expr']
+        symbols, function = node['function']
+        values = [self.nodes[str(symbol)]['value'] for symbol in symbols]
+        if any(isinstance(value, sp.Basic) for value in values):
+            # A dependency is still symbolic, substitute rather than evaluate numerically
+            return node['expr'].subs(dict(zip(symbols, values)))
+        return function(*values)
+
+    def _mark_dirty(self, name):
+        for dependent in self.dependents(name):
+            self.nodes[dependent]['dirty'] = True
+
+    def _ordered(self, names):
+        """Order names so every variable comes after the variables it depends on."""
+        names = set(names)
+        ordered = []
+        visited = set()
+
+        def visit(current):
+            if current in visited:
+                return
+            visited.add(current)
+            for dep in sorted(self.nodes[current]['depends_on']):
+                visit(dep)
+            if current in names:
+                ordered.append(current)
+
+        for name in self.nodes:
+            visit(name)
+        return ordered
+
+    def _render(self, name):
+        node = self.nodes[name]
+        if not node['show']:
+            return
+        if node['expr'] is None or node['value'] is node['expr']:
+            equation_latex = format_equation(name, node['value'])
+        else:
+            equation_latex = f"{format_equation(name, node['expr'])} = {format_value(node['value'])}"
+
+        update = node['display_id'] is not None
+        if not update:
+            node['display_id'] = f"calcgraph-{id(self)}-{name}"
+        render_content(equation_latex, comment=node['comment'], content_type='latex',
+                       display_id=node['display_id'], update=update, **node['display_options'])
+
+    def _same_definition(self, node, expr, value, depends_on, comment, show, display_options):
+        if (node['comment'], node['show'], node['display_options']) != (comment, show, display_options):
+            return False
+        if expr is None:
+            return node['expr'] is None and self._same_value(node['value'], value)
+        return node['expr'] == expr and node['depends_on'] == depends_on
+
+    @staticmethod
+    def _same_value(a, b):
+        if type(a) is not type(b):
+            return False
+        try:
+            if isinstance(a, u.Quantity):
+                # pint's == converts units, 0.2 m**2 and 200000 mm**2 must still count as a change
+                return a.units == b.units and bool(np.all(a.magnitude == b.magnitude))
+            return bool(np.all(a == b))
+        except Exception:
+            return False
@@ -0,0 +1,186 @@
+import json
+import re
+import traceback
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+import pandas as pd
+from .report import Report
+
+def run_notebook_calc(notebook_path, **params):
+    """
+    Execute the code cells of a calculation notebook with the given input parameters.
+
+    As with papermill, the parameters are injected after the cell tagged 'parameters',
+    so that cell can assign the notebook's default inputs. Without a tagged cell they
+    are injected before the first cell runs. A warning is given for any parameter a
+    later cell reassigns, since the run would then not use the given value.
+    IPython magics and shell escapes are skipped.
+
+    Returns:
+        The namespace after all cells have run
+    """
+    with open(notebook_path, 'r', encoding='utf-8') as f:
+        notebook = json.load(f)
+
+    code_cells = [cell for cell in notebook['cells'] if cell['cell_type'] == 'code']
+    tagged = [i for i, cell in enumerate(code_cells) if 'parameters' in cell.get('metadata', {}).get('tags', [])]
+    inject_after = tagged[0] if tagged else -1
+
+    namespace = {'__name__': '__calcreport__'}
+    if inject_after == -1:
+        namespace.update(params)
+    reassigned = []
+    for i, cell in enumerate(code_cells):
+        source = ''.join(cell['source'])
+        source = re.sub(r'^\s*[%!].*$', '', source, flags=re.MULTILINE)
+        exec(compile(source, notebook_path, 'exec'), namespace)
+        if i == inject_after:
+            namespace.update(params)
+        elif i > inject_after:
+            reassigned.extend(name for name, value in params.items()
+                              if namespace.get(name) is not value and name not in reassigned)
+    if reassigned:
+        hint = '' if tagged else ", tag the cell assigning default inputs 'parameters'"
+        warnings.warn(f"{notebook_path}: parameters {', '.join(reassigned)} are reassigned by the notebook{hint}")
+    return namespace
+
+def _run_single(calc, name, params, result_keys, report_options, output_path, keep_cells):
+    """Run one parameter set in a worker process and write its report."""
+    report = Report(**{**report_options, 'title': f"{report_options.get('title', '')} - {name}".strip(' -')})
+    outcome = {'name': name, 'status': 'ok', 'error': '', 'warnings': '', 'results': {}, 'cells': None}
+    try:
+        with report, warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            if isinstance(calc, (str, Path)):
+                results = run_notebook_calc(str(calc), **params)
+            else:
+                results = calc(**params)
+        outcome['warnings'] = '\n'.join(str(warning.message) for warning in caught)
+
+        if isinstance(results, dict):
+            keys = result_keys if result_keys is not None else results.keys()
+            outcome['results'] = {key: results[key] for key in keys if key in results}
+        if output_path:
+            report.save(output_path)
+        if keep_cells:
+            # Drop the per-run cover page, the combined report has its own
+            outcome['cells'] = report.cells[1:]
+    except Exception:
+        outcome['status'] = 'failed'
+        outcome['error'] = traceback.format_exc()
+    return outcome
+
+def _safe_filename(name):
+    """Turn a run name into a filename without path separators or other special characters."""
+    return re.sub(r'[^\w.-]+', '_', name).strip('._') or 'run'
+
+def _demote_headings(cells):
+    """Push markdown headings down one level so a run's sections nest under its own section."""
+    demoted = []
+    for cell in cells:
+        if cell['cell_type'] == 'markdown':
+            source = re.sub(r'^(#{1,5})\s', r'#\1 ', ''.join(cell['source']), flags=re.MULTILINE)
+            cell = {**cell, 'source': [source]}
+        demoted.append(cell)
+    return demoted
+
+def run_parametric(calc, parameter_sets, output_dir, names=None, workers=None, combined=False,
+                   separate_reports=True, result_keys=None, report_options=None, progress=True):
+    """
+    Run the same calculation for many input parameter sets on a process pool.
+
+    Each run gets its own Report, so displaymath and create_results_table output
+    from the calculation is collected in the worker and written without a notebook.
+
+    Args:
+        calc: Function taking the parameters as keyword arguments, or the path to a
+            calculation notebook (see run_notebook_calc). A function must be defined
+            at module level so it can be sent to the worker processes. It may return
+            a dictionary of key results for the summary table.
+        parameter_sets: DataFrame with one row per run, or a list of parameter dictionaries.
+        output_dir: Directory the reports and summary are written to.
+        names: Optional run names, used for the summary and, with characters other than
+            letters, digits, '-', '_' and '.' replaced, for filenames. Names must be unique.
+            Defaults to the DataFrame index or 'run-1', 'run-2', ...
+        workers: Number of worker processes. Defaults to the number of CPUs.
+        combined: Also write a single report with a summary section followed by one
+            section per run, with the run's own headings nested beneath it.
+        separate_reports: Write one report per run.
+        result_keys: Keys of the returned results (or notebook variables) to include in
+            the summary. Defaults to everything a function returns.
+        report_options: Keyword arguments for Report, eg title, client, project.
+        progress: Print a line as each run finishes.
+
+    Returns:
+        DataFrame summarizing every run: name, status, inputs, key results and any
+        warnings or error
+    """
+    if isinstance(parameter_sets, pd.DataFrame):
+        if names is None:
+            names = [str(index) for index in parameter_sets.index]
+        parameter_sets = parameter_sets.to_dict('records')
+    parameter_sets = list(parameter_sets)
+    if names is None:
+        names = [f"run-{i + 1}" for i in range(len(parameter_sets))]
+    names = [str(name) for name in names]
+    filenames = [_safe_filename(name) for name in names]
+    if len(names) != len(parameter_sets):
+        raise ValueError(f"{len(names)} names given for {len(parameter_sets)} parameter sets")
+    duplicates = sorted({name for name, filename in zip(names, filenames) if filenames.count(filename) > 1})
+    if duplicates:
+        raise ValueError(f"Run names must be unique, and stay unique as filenames: {', '.join(duplicates)}")
+    if isinstance(calc, (str, Path)) and result_keys is None:
+        raise ValueError("result_keys must be given when running a notebook")
+    report_options = report_options or {}
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    outcomes = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(
+                _run_single, calc, name, params, result_keys, report_options,
+                output_dir / f"{filename}.html" if separate_reports else None, combined
+            ): name
+            for name, filename, params in zip(names, filenames, parameter_sets)
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                outcome = future.result()
+            except Exception:
+                # The worker process itself died
+                outcome = {'name': name, 'status': 'failed', 'error': traceback.format_exc(),
+                           'warnings': '', 'results': {}, 'cells': None}
+            outcomes[name] = outcome
+            if progress:
+                print(f"[{len(outcomes)}/{len(futures)}] {name}: {outcome['status']}")
+
+    rows = []
+    for name, params in zip(names, parameter_sets):
+        outcome = outcomes[name]
+        rows.append({'name': name, 'status': outcome['status'], **params,
+                     **outcome['results'], 'warnings': outcome['warnings'], 'error': outcome['error']})
+    summary = pd.DataFrame(rows)
+    summary.to_csv(output_dir / 'summary.csv', index=False)
+
+    if combined:
+        report = Report(**report_options)
+        report.section('Summary of Results')
+        summary_table = summary.drop(columns=['warnings', 'error']).style.hide(axis='index').to_html(table_id="results_table")
+        report.add_html(summary_table.replace("<table", "<table class=results-table"))
+        for name in names:
+            outcome = outcomes[name]
+            report.section(name)
+            if outcome['cells']:
+                report.cells.extend(_demote_headings(outcome['cells']))
+            else:
+                report.markdown(f"Run failed:\n\n```\n{outcome['error']}\n```")
+        report.save(output_dir / 'combined.html')
+
+    failed = (summary['status'] != 'ok').sum()
+    if progress:
+        print(f"{len(summary) - failed} of {len(summary)} runs completed, {failed} failed. Summary saved to: {output_dir / 'summary.csv'}")
+    return summary
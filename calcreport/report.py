@@ -0,0 +1,97 @@
+from pathlib import Path
+
+_active_report = None
+
+def get_active_report():
+    """Return the report currently collecting output, or None."""
+    return _active_report
+
+class Report:
+    """
+    Collect calculation output in-process and export it without a notebook.
+
+    While a report is active, displaymath, render_content and create_results_table
+    write their HTML to it. Cells are held in notebook format so the exporter can
+    convert them directly, without serializing to an .ipynb file and reading it back.
+
+    Usage:
+        with Report(title='Connection Design', client='Client', project='Project') as report:
+            report.section('Loads')
+            displaymath(F_d)
+            report.save('report.html')
+    """
+
+    def __init__(self, title='', client='', project='', docid='', revision='', cover_page='', executive_summary=None):
+        self.cells = []
+        self._previous_report = None
+        cover_metadata = {'title': title, 'client': client, 'project': project, 'docid': docid, 'revision': revision}
+        self.markdown(f"# Cover Page\n{cover_page}", metadata=cover_metadata)
+        if executive_summary:
+            self.markdown(f"# Executive Summary\n{executive_summary}")
+
+    def __enter__(self):
+        return self.activate()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.deactivate()
+
+    def activate(self):
+        """Make this the report that calculation output is written to."""
+        global _active_report
+        self._previous_report = _active_report
+        _active_report = self
+        return self
+
+    def deactivate(self):
+        """Stop collecting output, restoring any previously active report."""
+        global _active_report
+        if _active_report is self:
+            _active_report = self._previous_report
+        self._previous_report = None
+
+    def markdown(self, text, metadata=None):
+        """Add a markdown cell."""
+        self.cells.append({
+            'cell_type': 'markdown',
+            'source': [text],
+            'metadata': metadata or {}
+        })
+
+    def section(self, title):
+        """Start a new top-level numbered section."""
+        self.heading(title, level=1)
+
+    def heading(self, title, level=2):
+        """Add a numbered heading at the given level (1-6)."""
+        self.markdown(f"{'#' * level} {title}")
+
+    def appendix(self, title='', **metadata):
+        """Start an appendix. Extra keyword arguments (filename, date, revision) are shown on its cover."""
+        metadata['title'] = title
+        self.markdown("# Appendix", metadata=metadata)
+
+    def add_html(self, html):
+        """Add HTML output. Consecutive outputs are grouped into a single code cell."""
+        if not self.cells or self.cells[-1]['cell_type'] != 'code':
+            self.cells.append({
+                'cell_type': 'code',
+                'source': [''],
+                'metadata': {},
+                'outputs': []
+            })
+        self.cells[-1]['outputs'].append({'data': {'text/html': [html]}})
+
+    def to_html(self):
+        """Convert the collected cells to an HTML document using the report template."""
+        from .export.notebooktohtml import NotebookToHTML
+        converter = NotebookToHTML()
+        # The exporter's debug output repeats the whole document and keeps it in memory
+        converter.debug_mode = False
+        return converter.convert_cells(self.cells)
+
+    def save(self, output_path):
+        """Write the report to an HTML file."""
+        from bs4 import BeautifulSoup
+        html_content = BeautifulSoup(self.to_html(), 'html.parser').prettify()
+        Path(output_path).write_text(html_content, encoding='utf-8')
+        print(f"HTML document saved to: {output_path}")
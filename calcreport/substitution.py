@@ -0,0 +1,141 @@
+import re
+import sympy as sp
+from .display import capture_var_name, render_content, debug_print
+from .units import u, format_number, format_quantity_latex
+from .utils import format_var_name
+
+SLOT_PATTERN = re.compile(r'SLOT([A-Z]+)')
+# Values that can be substituted into the template without parentheses
+PLAIN_NUMBER_PATTERN = re.compile(r'[0-9]+(\.[0-9]*)?')
+
+def _slot_name(index):
+    """Letters-only slot symbol name, so sympy prints it verbatim and in the same order as the symbols."""
+    letters = ''
+    for _ in range(4):
+        index, remainder = divmod(index, 26)
+        letters = chr(65 + remainder) + letters
+    return f"SLOT{letters}"
+
+class SubstitutionTemplate:
+    """
+    Formula, substituted values and result for one expression, compiled once.
+
+    The symbolic LaTeX and a LaTeX template with a slot for each symbol are printed
+    by sympy once, and the expression is compiled with lambdify. Rendering a new set
+    of values only formats the numbers and fills the slots.
+
+    Usage:
+        check = SubstitutionTemplate(P * L / 4)
+        for member in members:
+            check.display('M_max', {'P': member.P, 'L': member.L}, comment=member.name)
+    """
+
+    def __init__(self, expr):
+        self.expr = sp.sympify(expr)
+        self.symbols = sorted(self.expr.free_symbols, key=str)
+        slots = {symbol: sp.Symbol(_slot_name(i)) for i, symbol in enumerate(self.symbols)}
+        slot_names = {slot.name: symbol for symbol, slot in slots.items()}
+
+        self.formula_latex = sp.latex(self.expr)
+        # Explicit multiplication dots so adjacent numbers are not read as one
+        template = sp.latex(self.expr.xreplace(slots), mul_symbol='dot')
+        self._parts = []
+        self._slot_symbols = []
+        position = 0
+        for match in SLOT_PATTERN.finditer(template):
+            self._parts.append(template[position:match.start()])
+            self._slot_symbols.append(slot_names[match.group(0)])
+            position = match.end()
+        self._parts.append(template[position:])
+
+        self._function = sp.lambdify(self.symbols, self.expr, modules='numpy')
+        debug_print(f"Compiled substitution template: {template}")
+
+    def _values_by_symbol(self, values):
+        by_name = {str(key): value for key, value in values.items()}
+        return {symbol: by_name[str(symbol)] for symbol in self.symbols}
+
+    def evaluate(self, values):
+        """Evaluate the expression for a dictionary of values keyed by symbol or symbol name."""
+        values = self._values_by_symbol(values)
+        return self._function(*(values[symbol] for symbol in self.symbols))
+
+    def substitute(self, values, sig_figs=None, decimals=None):
+        """Fill the template with formatted values."""
+        values = self._values_by_symbol(values)
+        filled = [self._parts[0]]
+        for symbol, part in zip(self._slot_symbols, self._parts[1:]):
+            filled.append(self._format_slot(values[symbol], sig_figs, decimals))
+            filled.append(part)
+        return ''.join(filled)
+
+    @staticmethod
+    def _format_slot(value, sig_figs, decimals):
+        if isinstance(value, u.Quantity):
+            return rf"\left( {format_quantity_latex(value, sig_figs, decimals)} \right)"
+        value_latex = format_number(value, sig_figs, decimals)
+        # Negative values and scientific notation would otherwise bind to the surrounding operators
+        if PLAIN_NUMBER_PATTERN.fullmatch(value_latex):
+            return value_latex
+        return rf"\left( {value_latex} \right)"
+
+    def render(self, var_name, values, result_units=None, sig_figs=None, decimals=None):
+        """
+        Build the aligned formula = substituted values = result LaTeX.
+
+        Returns:
+            (latex, result) tuple
+        """
+        result = self.evaluate(values)
+        if isinstance(result, u.Quantity):
+            if result_units is not None:
+                result = result.to(result_units)
+            result_latex = format_quantity_latex(result, sig_figs, decimals)
+        else:
+            result_latex = format_number(result, sig_figs, decimals)
+
+        lines = [
+            f"{format_var_name(var_name)} &= {self.formula_latex}",
+            f"&= {self.substitute(values, sig_figs, decimals)}",
+            f"&= {result_latex}",
+        ]
+        return r"\begin{aligned} " + r" \\ ".join(lines) + r" \end{aligned}", result
+
+    def display(self, var_name, values, comment='', result_units=None, sig_figs=None, decimals=None, **display_options):
+        """Render the formula, substituted values and result as one equation. Returns the result."""
+        equation_latex, result = self.render(var_name, values, result_units, sig_figs, decimals)
+        render_content(equation_latex, comment=comment, content_type='latex', **display_options)
+        return result
+
+_templates = {}
+
+def get_template(expr):
+    """Return the compiled SubstitutionTemplate for an expression, compiling it on first use."""
+    expr = sp.sympify(expr)
+    template = _templates.get(expr)
+    if template is None:
+        template = _templates[expr] = SubstitutionTemplate(expr)
+    return template
+
+@capture_var_name
+def displaysubs(var_name, expr, values, comment='', result_units=None, sig_figs=None, decimals=None, **display_options):
+    """
+    Display a check as formula, formula with values substituted, and result in one call.
+
+    Like displaymath, the variable name is taken from the variable passed in. Compiled
+    templates are reused for the same expression, so repeating a check across many
+    members or load cases only formats numbers.
+
+    Args:
+        expr: SymPy expression
+        values: Dictionary of values (numbers or pint Quantities) keyed by symbol or symbol name
+        comment: Comment shown next to the equation
+        result_units: Units to convert a Quantity result to
+        sig_figs: Significant figures for substituted values and the result
+        decimals: Decimal places, if sig_figs is not given
+
+    Returns:
+        The evaluated result
+    """
+    return get_template(expr).display(var_name, values, comment=comment, result_units=result_units,
+                                      sig_figs=sig_figs, decimals=decimals, **display_options)
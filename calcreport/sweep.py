@@ -0,0 +1,160 @@
+import numpy as np
+import pandas as pd
+import sympy as sp
+from .units import u, unit_html
+from .display import results_table_html
+
+class LoadCaseSweep:
+    """
+    Evaluate solved expressions for many load cases at once.
+
+    The expressions are compiled once with NumPy-backed lambdify and evaluated with
+    one array per input, so the cost of a sweep does not grow with Python-level work
+    per case. Inputs may be pint Quantity arrays, in which case units are carried
+    through the NumPy operations and each result column keeps its units.
+
+    Usage:
+        sweep = LoadCaseSweep(sp.solve([eq1, eq2], [R_A, R_B], dict=True)[0])
+        results = sweep.evaluate({'P': Q_(np.array([...]), u.kN), 'L': Q_(np.array([...]), u.m)})
+        results.results_table()
+    """
+
+    def __init__(self, expressions, inputs=None):
+        """
+        Args:
+            expressions: Result expressions as a dictionary of name (or symbol) to sympy
+                expression, for example a solution from sp.solve(..., dict=True), or a
+                list of sympy Equalities with a single symbol on the left hand side.
+            inputs: Input symbols in argument order. Defaults to the free symbols of the
+                expressions that are not themselves results, sorted by name.
+        """
+        if isinstance(expressions, dict):
+            expressions = {name if isinstance(name, sp.Symbol) else sp.Symbol(name): sp.sympify(expr)
+                           for name, expr in expressions.items()}
+        else:
+            expressions = {eq.lhs: eq.rhs for eq in expressions}
+
+        # Results may be written in terms of other results, express everything in inputs only
+        for _ in range(len(expressions)):
+            substituted = {name: expr.xreplace(expressions) for name, expr in expressions.items()}
+            if substituted == expressions:
+                break
+            expressions = substituted
+
+        if inputs is None:
+            free_symbols = set().union(*(expr.free_symbols for expr in expressions.values()))
+            inputs = sorted(free_symbols - set(expressions), key=str)
+
+        self.expressions = expressions
+        self.inputs = list(inputs)
+        self.output_names = [str(name) for name in expressions]
+        self._function = sp.lambdify(self.inputs, list(expressions.values()), modules='numpy')
+
+    def evaluate(self, cases, case_names=None):
+        """
+        Evaluate every result for all load cases.
+
+        Args:
+            cases: DataFrame with one column per input, or a dictionary mapping input
+                names to arrays or pint Quantity arrays. Scalars are broadcast.
+            case_names: Optional names for the load cases. Defaults to the DataFrame
+                index or 'Case 1', 'Case 2', ...
+
+        Returns:
+            SweepResult holding one array per result
+        """
+        if isinstance(cases, pd.DataFrame):
+            if case_names is None:
+                case_names = [str(index) for index in cases.index]
+            cases = {name: cases[name].to_numpy() for name in cases.columns}
+
+        args = []
+        for symbol in self.inputs:
+            value = cases[str(symbol)]
+            if not isinstance(value, u.Quantity):
+                value = np.asarray(value)
+            args.append(value)
+
+        case_count = max((np.size(arg) for arg in args), default=1)
+        columns = {}
+        for name, value in zip(self.output_names, self._function(*args)):
+            if isinstance(value, u.Quantity):
+                columns[name] = u.Quantity(np.broadcast_to(value.magnitude, (case_count,)), value.units)
+            else:
+                columns[name] = np.broadcast_to(np.asarray(value, dtype=float), (case_count,))
+
+        if case_names is None:
+            case_names = [f"Case {i+1}" for i in range(case_count)]
+        return SweepResult(columns, case_names)
+
+class SweepResult:
+    """Result arrays of a LoadCaseSweep, one per result, indexed by load case."""
+
+    def __init__(self, columns, case_names):
+        self.columns = columns
+        self.case_names = list(case_names)
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def magnitudes(self, name):
+        """Return the plain NumPy array of a result column."""
+        value = self.columns[name]
+        return value.magnitude if isinstance(value, u.Quantity) else value
+
+    def governing(self):
+        """
+        Find the governing load case of each result column.
+
+        Returns:
+            DataFrame indexed by result name with the case name and index of the
+            maximum and minimum values
+        """
+        rows = {}
+        for name in self.columns:
+            values = self.magnitudes(name)
+            max_index, min_index = int(np.argmax(values)), int(np.argmin(values))
+            rows[name] = {
+                'max_case': self.case_names[max_index], 'max_index': max_index,
+                'min_case': self.case_names[min_index], 'min_index': min_index,
+            }
+        return pd.DataFrame.from_dict(rows, orient='index')
+
+    def to_dataframe(self):
+        """Return the results as a DataFrame of magnitudes, one column per result."""
+        return pd.DataFrame({name: self.magnitudes(name) for name in self.columns}, index=self.case_names)
+
+    def results_table(self, decimals=2, units=None, highlight_governing=True, custom_classes="results-table"):
+        """
+        Create a results table with one row per load case.
+
+        Args:
+            decimals: Number of decimal places shown.
+            units: Optional dictionary mapping result names to the units to display them in.
+            highlight_governing: Mark the maximum and minimum of each column with the
+                governing-max and governing-min CSS classes.
+            custom_classes: CSS classes for the table element.
+        """
+        units = units or {}
+        data = {'Load Case': self.case_names}
+        cell_classes = {'Load Case': np.full(len(self.case_names), '', dtype=object)}
+        case_index = np.arange(len(self.case_names))
+
+        for name, value in self.columns.items():
+            unit_text = ''
+            if isinstance(value, u.Quantity):
+                if name in units:
+                    value = value.to(units[name])
+                unit_text = f" {unit_html(value.units)}"
+                value = value.magnitude
+            formatted = np.char.mod(f"%.{decimals}f", np.asarray(value, dtype=float))
+            data[name] = np.char.add(formatted, unit_text)
+
+            classes = np.full(len(self.case_names), '', dtype=object)
+            if highlight_governing:
+                classes = np.where(case_index == np.argmax(value), 'governing-max', classes)
+                classes = np.where(case_index == np.argmin(value), classes + ' governing-min', classes)
+            cell_classes[name] = classes
+
+        df = pd.DataFrame(data)
+        return results_table_html(df, custom_classes=custom_classes, cell_classes=pd.DataFrame(cell_classes))
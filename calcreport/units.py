@@ -1,12 +1,131 @@
+import functools
+import numpy as np
 import pint
 
 # Initialize pint
 u = pint.UnitRegistry()
 u.formatter.default_format = '~P'
 Q_ = u.Quantity
+# Quantities pickled in worker processes unpickle against this registry
+pint.set_application_registry(u)
 
 # Silence NEP 18 warning
 import warnings
 with warnings.catch_warnings():
     warnings.simplefilter("ignore")
-    Q_([])
\ No newline at end of file
+    Q_([])
+
+# Significant figures used when no precision is given, matching sympy's float printing
+DEFAULT_SIG_FIGS = 15
+# Powers of ten shown in fixed notation when significant figures are given, others use scientific notation
+FIXED_NOTATION_EXPONENTS = range(-3, 6)
+
+def _format_exponent(exponent):
+    return str(int(exponent)) if float(exponent).is_integer() else f"{exponent:g}"
+
+@functools.lru_cache(maxsize=None)
+def _unit_terms(unit):
+    """Split a unit into (symbol, exponent) pairs for the numerator and denominator, memoized per unit."""
+    numerator, denominator = [], []
+    for name, exponent in unit._units.items():
+        symbol = u.get_symbol(name)
+        if exponent > 0:
+            numerator.append((symbol, exponent))
+        else:
+            denominator.append((symbol, -exponent))
+    return tuple(numerator), tuple(denominator)
+
+@functools.lru_cache(maxsize=None)
+def unit_latex(unit):
+    """Format a pint unit as LaTeX, eg kN*m/s**2 gives \\frac{\\mathrm{kN} \\cdot \\mathrm{m}}{\\mathrm{s}^{2}}."""
+    def join(terms):
+        return r" \cdot ".join(
+            rf"\mathrm{{{symbol}}}" + ('' if exponent == 1 else f"^{{{_format_exponent(exponent)}}}")
+            for symbol, exponent in terms
+        )
+
+    numerator, denominator = _unit_terms(unit)
+    if not denominator:
+        return join(numerator)
+    if not numerator:
+        return join((symbol, -exponent) for symbol, exponent in denominator)
+    return rf"\frac{{{join(numerator)}}}{{{join(denominator)}}}"
+
+@functools.lru_cache(maxsize=None)
+def unit_html(unit):
+    """Format a pint unit as HTML, eg kN*m/s**2 gives kN·m/s<sup>2</sup>."""
+    def join(terms):
+        return "·".join(
+            symbol + ('' if exponent == 1 else f"<sup>{_format_exponent(exponent)}</sup>")
+            for symbol, exponent in terms
+        )
+
+    numerator, denominator = _unit_terms(unit)
+    if not denominator:
+        return join(numerator)
+    if not numerator:
+        return join((symbol, -exponent) for symbol, exponent in denominator)
+    denominator_html = join(denominator)
+    if len(denominator) > 1:
+        denominator_html = f"({denominator_html})"
+    return f"{join(numerator)}/{denominator_html}"
+
+def _format_sig_figs(value, sig_figs):
+    """Format with exactly sig_figs significant figures, keeping trailing zeros."""
+    if not np.isfinite(value) or value == 0:
+        return f"{value:#.{sig_figs}g}".rstrip('.')
+    # Round first, so the exponent accounts for carries (9.99 to 2 figures is 10)
+    # and digits beyond sig_figs are zeroed before fixed notation (1234 to 2 figures is 1200)
+    rounded = f"{value:.{sig_figs - 1}e}"
+    exponent = int(rounded.split('e')[1])
+    if exponent in FIXED_NOTATION_EXPONENTS:
+        return f"{float(rounded):.{max(sig_figs - 1 - exponent, 0)}f}"
+    return f"{value:.{sig_figs - 1}e}"
+
+def format_number(value, sig_figs=None, decimals=None, style='latex'):
+    """
+    Format a number without going through sympy.
+
+    Args:
+        value: Number to format
+        sig_figs: Significant figures to show. Takes precedence over decimals.
+        decimals: Fixed number of decimal places to show.
+        style: 'latex' or 'html', used for the power of ten in scientific notation.
+    """
+    if isinstance(value, (int, np.integer)) and sig_figs is None and decimals is None:
+        return str(value)
+    if sig_figs is not None:
+        text = _format_sig_figs(value, sig_figs)
+    elif decimals is not None:
+        text = f"{value:.{decimals}f}"
+    else:
+        text = f"{value:.{DEFAULT_SIG_FIGS}g}"
+
+    if 'e' in text:
+        mantissa, exponent = text.split('e')
+        exponent = int(exponent)
+        if style == 'latex':
+            return rf"{mantissa} \times 10^{{{exponent}}}"
+        return f"{mantissa}×10<sup>{exponent}</sup>"
+    return text
+
+def _format_magnitude_latex(magnitude, sig_figs, decimals):
+    if isinstance(magnitude, np.ndarray):
+        rows = magnitude.reshape(-1, 1) if magnitude.ndim == 1 else magnitude
+        body = r" \\ ".join(
+            " & ".join(format_number(value, sig_figs, decimals) for value in row) for row in rows
+        )
+        return rf"\left[\begin{{matrix}}{body}\end{{matrix}}\right]"
+    return format_number(magnitude, sig_figs, decimals)
+
+def format_quantity_latex(quantity, sig_figs=None, decimals=None):
+    """Format a pint Quantity as LaTeX, eg 12.5 \\, \\mathrm{kN}."""
+    magnitude_latex = _format_magnitude_latex(quantity.magnitude, sig_figs, decimals)
+    units = unit_latex(quantity.units)
+    return f"{magnitude_latex} \\, {units}" if units else magnitude_latex
+
+def format_quantity_html(quantity, sig_figs=None, decimals=None):
+    """Format a scalar pint Quantity as HTML, eg 12.50 kN."""
+    magnitude_html = format_number(quantity.magnitude, sig_figs, decimals, style='html')
+    units = unit_html(quantity.units)
+    return f"{magnitude_html} {units}" if units else magnitude_html
@@ -15,6 +15,7 @@ setup(
         'calcreport': [
             'export/templates/*',
             'export/templates/js/*',
+            'export/scripts/*',
         ]
     },
     include_package_data=True,